@@ -1,6 +1,7 @@
 # ac_model.py
 
 import random
+import zipfile
 from typing import List, Tuple
 
 import numpy as np
@@ -226,7 +227,13 @@ class A2CAgent:
     def save(self, path: str):
         torch.save(self.ac_net.state_dict(), path)
 
-    def load(self, path: str):
-        self.ac_net.load_state_dict(torch.load(path, map_location=self.device))
+    def load(self, path: str, mmap: bool = False):
+        # mmap=True: 체크포인트를 CPU에 메모리 매핑으로 열어 통째로 읽어 복사하지 않음 (로드 시 메모리 2배 방지)
+        # (zip 형식 체크포인트만 매핑 가능 → 구형식이면 일반 로드)
+        if mmap and zipfile.is_zipfile(path):
+            state_dict = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+        else:
+            state_dict = torch.load(path, map_location=self.device)
+        self.ac_net.load_state_dict(state_dict)
         self.ac_net.to(self.device)
         self.ac_net.eval()
\ No newline at end of file
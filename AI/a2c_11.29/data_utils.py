@@ -20,30 +20,33 @@ except Exception:
             "  pip install ta          (대체 라이브러리)"
         ) from e
 
+    import indicators_numba as _nb
+
     class _PTAWrapper:
+        # SMA/EMA/MACD/RSI는 ta와 같은 결과를 내는 Numba 커널로 계산 (indicators_numba.py)
         @staticmethod
         def ema(close, length=12):
-            return _ta.trend.EMAIndicator(close=close, window=length).ema_indicator()
+            return pd.Series(_nb.ema(close.to_numpy(dtype=np.float64), length), index=close.index)
 
         @staticmethod
         def sma(close, length=20):
-            return _ta.trend.SMAIndicator(close=close, window=length).sma_indicator()
+            return pd.Series(_nb.sma(close.to_numpy(dtype=np.float64), length), index=close.index)
 
         @staticmethod
         def macd(close, fast=12, slow=26, signal=9):
-            ind = _ta.trend.MACD(close=close, window_slow=slow, window_fast=fast, window_sign=signal)
+            line, sig, diff = _nb.macd(close.to_numpy(dtype=np.float64), fast, slow, signal)
             # pandas_ta returns DataFrame with columns like MACD_12_26_9, MACDs_12_26_9, MACDh_12_26_9
             # But here we just need the object to access columns later?
             # data_utils.py uses: macd.iloc[:, 0] (MACD line)
             return pd.DataFrame({
-                f"MACD_{fast}_{slow}_{signal}": ind.macd(),
-                f"MACDs_{fast}_{slow}_{signal}": ind.macd_signal(),
-                f"MACDh_{fast}_{slow}_{signal}": ind.macd_diff()
-            })
+                f"MACD_{fast}_{slow}_{signal}": line,
+                f"MACDs_{fast}_{slow}_{signal}": sig,
+                f"MACDh_{fast}_{slow}_{signal}": diff
+            }, index=close.index)
 
         @staticmethod
         def rsi(close, length=14):
-            return _ta.momentum.RSIIndicator(close=close, window=length).rsi()
+            return pd.Series(_nb.rsi(close.to_numpy(dtype=np.float64), length), index=close.index)
 
         @staticmethod
         def stoch(high, low, close, k=14, d=3):
@@ -0,0 +1,147 @@
+# indicators_numba.py
+
+"""
+ta 라이브러리(SMA/EMA/MACD/RSI)와 같은 결과를 내는 Numba 커널.
+
+data_utils.add_indicators가 ta 래퍼(_PTAWrapper)를 사용할 때,
+pandas rolling/ewm 대신 float64 배열 위에서 바로 계산한다.
+- SMA : close.rolling(window, min_periods=window).mean()
+- EMA : close.ewm(span=window, min_periods=window, adjust=False).mean()
+- RSI : Wilder 방식 (ewm(alpha=1/window, adjust=False)), ta.momentum.RSIIndicator와 동일
+- MACD: EMA(fast) - EMA(slow), signal = EMA(MACD, signal)
+
+numba가 설치되어 있지 않으면 같은 코드를 순수 파이썬으로 실행한다 (결과 동일, 속도만 느림).
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba 미설치 환경
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+# ============================================================
+# 1. 기본 커널
+# ============================================================
+
+@njit(cache=True)
+def ewm_mean(x: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """
+    pandas Series.ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean() 과 동일.
+    (NaN은 관측치로 세지 않고, ignore_na=False 규칙대로 이전 가중치를 감쇠)
+    """
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+
+    old_wt_factor = 1.0 - alpha
+    new_wt = alpha
+
+    weighted = x[0]
+    nobs = 1 if weighted == weighted else 0
+    out[0] = weighted if nobs >= min_periods else np.nan
+    old_wt = 1.0
+
+    for i in range(1, n):
+        cur = x[i]
+        is_observation = cur == cur
+        if is_observation:
+            nobs += 1
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted if nobs >= min_periods else np.nan
+    return out
+
+
+@njit(cache=True)
+def sma(x: np.ndarray, window: int) -> np.ndarray:
+    """rolling(window, min_periods=window).mean() (윈도우 안에 NaN이 있으면 NaN)"""
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    comp = 0.0  # Kahan 보정항 (긴 구간에서 누적 오차 방지)
+    nobs = 0
+    for i in range(n):
+        v = x[i]
+        if v == v:
+            nobs += 1
+            y = v - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+        if i >= window:
+            old = x[i - window]
+            if old == old:
+                nobs -= 1
+                y = -old - comp
+                t = total + y
+                comp = (t - total) - y
+                total = t
+        if i >= window - 1 and nobs >= window:
+            out[i] = total / nobs
+    return out
+
+
+# ============================================================
+# 2. 지표
+# ============================================================
+
+@njit(cache=True)
+def ema(close: np.ndarray, window: int) -> np.ndarray:
+    """ta.trend.EMAIndicator(close, window).ema_indicator()"""
+    return ewm_mean(close, 2.0 / (window + 1.0), window)
+
+
+@njit(cache=True)
+def macd(close: np.ndarray, fast: int, slow: int, signal: int):
+    """ta.trend.MACD → (macd, macd_signal, macd_diff)"""
+    line = ema(close, fast) - ema(close, slow)
+    sig = ewm_mean(line, 2.0 / (signal + 1.0), signal)
+    return line, sig, line - sig
+
+
+@njit(cache=True)
+def rsi(close: np.ndarray, window: int) -> np.ndarray:
+    """ta.momentum.RSIIndicator(close, window).rsi()"""
+    n = close.shape[0]
+    up = np.zeros(n)
+    down = np.zeros(n)
+    # 상승폭/하락폭 (첫 행과 NaN 구간은 ta와 같이 0)
+    for i in range(1, n):
+        diff = close[i] - close[i - 1]
+        if diff > 0:
+            up[i] = diff
+        elif diff < 0:
+            down[i] = -diff
+
+    alpha = 1.0 / window
+    emaup = ewm_mean(up, alpha, window)
+    emadn = ewm_mean(down, alpha, window)
+
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        if emadn[i] == 0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - (100.0 / (1.0 + emaup[i] / emadn[i]))
+    return out
+
+
+def warmup():
+    """JIT 컴파일을 미리 수행 (서버 시작 시 호출하면 첫 요청이 컴파일 비용을 떠안지 않음)"""
+    dummy = np.linspace(1.0, 2.0, 32)
+    sma(dummy, 20)
+    ema(dummy, 12)
+    macd(dummy, 12, 26, 9)
+    rsi(dummy, 14)
@@ -0,0 +1,49 @@
+# scaler_io.py
+
+"""
+StandardScaler 파라미터(mean_, scale_, 피처 이름)를 .npz로 저장/로드.
+
+추론 시에는 (X - mean) / scale 계산만 필요하므로, joblib(pickle)로 sklearn 객체 전체를
+복원하지 않고 배열 두 개만 읽는다 (sklearn import 불필요).
+
+기존 scaler.joblib 변환:
+    python scaler_io.py reports/scaler.joblib
+"""
+
+import os
+import sys
+from typing import List, Tuple
+
+import numpy as np
+
+
+def save_scaler_npz(scaler, path: str):
+    """학습된 StandardScaler → npz (mean, scale, names)"""
+    n = scaler.n_features_in_
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n)
+    scale = scaler.scale_ if scaler.with_std else np.ones(n)
+    names = getattr(scaler, "feature_names_in_", None)
+    if names is None:
+        names = np.array([], dtype=str)
+
+    np.savez(
+        path,
+        mean=np.asarray(mean, dtype=np.float64),
+        scale=np.asarray(scale, dtype=np.float64),
+        names=np.asarray(names, dtype=str),
+    )
+
+
+def load_scaler_npz(path: str) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """npz → (mean, scale, names). names가 비어 있으면 학습 시 피처 이름이 없었던 것"""
+    with np.load(path) as z:
+        return z["mean"], z["scale"], z["names"].tolist()
+
+
+if __name__ == "__main__":
+    import joblib
+
+    src = sys.argv[1] if len(sys.argv) > 1 else os.path.join("reports", "scaler.joblib")
+    dst = os.path.splitext(src)[0] + ".npz"
+    save_scaler_npz(joblib.load(src), dst)
+    print(f"Scaler 변환 완료: {src} -> {dst}")
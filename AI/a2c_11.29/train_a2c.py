@@ -11,6 +11,7 @@ from sklearn.preprocessing import StandardScaler
 from data_utils import download_data, add_indicators, FEATURES
 from trading_env import TradingEnv
 from ac_model import A2CAgent
+from scaler_io import save_scaler_npz
 
 
 # --- A2C용 검증(Validation) 함수 ---
@@ -106,6 +107,8 @@ def run_training():
     # 4. 스케일러 저장
     scaler_path = os.path.join(report_dir, "scaler.joblib")
     joblib.dump(scaler, scaler_path)
+    # 서버 추론용: mean/scale 배열만 담은 npz (sklearn/pickle 없이 로드)
+    save_scaler_npz(scaler, os.path.join(report_dir, "scaler.npz"))
     print(f"Scaler 저장 완료: {scaler_path}")
 
     # 5. 환경 및 에이전트 생성 (A2C)
@@ -1,12 +1,28 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
+import json
 import pickle
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 
 # --- Config ---
 from marl_config import TICKER, VIX_TICKER, START_DATE, END_DATE
 
+
+def _scaler_to_json(scaler):
+    """스케일러 항목 하나를 JSON으로 저장할 수 있는 dict로 변환"""
+    if isinstance(scaler, StandardScaler):
+        return {
+            'type': 'standard',
+            'mean': None if scaler.mean_ is None else scaler.mean_.tolist(),
+            'scale': None if scaler.scale_ is None else scaler.scale_.tolist(),
+        }
+    if isinstance(scaler, MinMaxScaler):
+        return {'type': 'minmax', 'min': scaler.min_.tolist(), 'scale': scaler.scale_.tolist()}
+    # {'type': 'price', 'first_val': np.float64(...)} 같은 dict 항목
+    return {k: (v.item() if isinstance(v, np.generic) else v) for k, v in scaler.items()}
+
+
 # ---- pandas-ta 호환 래퍼 -----------------------------
 try:
     import pandas_ta as ta
@@ -346,6 +362,27 @@ class DataProcessor:
         except Exception as e:
             print(f"⚠️ 스케일러 저장 실패: {e}")
 
+    def save_scalers_json(self, filename='scalers.json'):
+        """스케일러를 JSON으로 저장 (sklearn 객체는 변환 파라미터만 저장 → 로드 시 pickle/sklearn 불필요)"""
+        try:
+            data = {col: _scaler_to_json(s) for col, s in self.scalers.items()}
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            print(f"✅ 스케일러 저장 완료: {filename}")
+        except Exception as e:
+            print(f"⚠️ 스케일러 저장 실패: {e}")
+
+    def load_scalers_json(self, filename='scalers.json'):
+        """save_scalers_json으로 저장한 스케일러 로드. 성공 여부 반환"""
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                self.scalers = json.load(f)
+            print(f"✅ 스케일러 로드 완료: {filename}")
+            return True
+        except Exception as e:
+            print(f"⚠️ 스케일러 로드 실패: {e}")
+            return False
+
     def load_scalers(self, filename='scalers.pkl'):
         try:
             with open(filename, 'rb') as f:
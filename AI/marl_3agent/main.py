@@ -177,6 +177,7 @@ def main():
     )
 
     processor.save_scalers('scalers.pkl')
+    processor.save_scalers_json('scalers.json')
 
     train_env = MARLStockEnv(
         train_features, train_prices, 
@@ -1,16 +1,24 @@
+from types import MappingProxyType
+
 import numpy as np
 
+# 에이전트 행동 의미 -> 투표 점수 (호출마다 dict를 새로 만들지 않도록 모듈 상수로 둠, 읽기 전용)
+ACTION_TO_SCORE = MappingProxyType({"Long": 1, "Hold": 0, "Short": -1})
+
+# print_ui_output에서 간략히 출력할 주요 지표
+KEY_INDICATORS = frozenset({"SMA20", "RSI", "MACD", "VIX"})
+
+# 투표 합계(-3 ~ +3) -> 최종 신호. 인덱스 = 합계 + 3
+SCORE_TO_SIGNAL = ("적극 매도", "매도", "매도", "보유", "매수", "매수", "적극 매수")
+
 def convert_joint_action_to_signal(joint_action, action_map):
     """3개 에이전트의 행동을 종합하여 최종 매매 신호 생성"""
-    action_to_score = {"Long": 1, "Hold": 0, "Short": -1}
-    score = sum(action_to_score[action_map[a]] for a in joint_action)
-    
-    if score >= 3: return "적극 매수"
-    elif score > 0: return "매수"
-    elif score == 0: return "보유"
-    elif score < 0 and score > -3: return "매도"
-    elif score <= -3: return "적극 매도"
-    return "보유"
+    score = 0
+    for a in joint_action:
+        score += ACTION_TO_SCORE[action_map[a]]
+
+    # 에이전트 수가 3이 아닐 때도 기존 규칙(3 이상 적극 매수, -3 이하 적극 매도)과 같도록 범위 제한
+    return SCORE_TO_SIGNAL[min(max(score, -3), 3) + 3]
 
 def get_top_features_marl(agent_analyses, top_k=3):
     """MARL 에이전트들의 분석 결과를 종합하여 Top K 중요 지표 추출"""
@@ -19,10 +27,23 @@ def get_top_features_marl(agent_analyses, top_k=3):
         for feature, imp in importance_list:
             all_importances[feature] = all_importances.get(feature, 0.0) + imp
             
-    sorted_features = sorted(all_importances.items(), key=lambda item: item[1], reverse=True)
-    
+    if not all_importances:
+        return []
+
+    # 전체 정렬 대신 partition으로 k번째 값만 구해서 상위 k개를 고른 뒤, 그 k개만 내림차순 정렬
+    # (동점은 기존 sorted와 같이 먼저 등장한 지표 우선)
+    names = list(all_importances.keys())
+    values = np.fromiter(all_importances.values(), dtype=np.float64, count=len(names))
+    k = min(top_k, len(values))
+    kth = -np.partition(-values, k - 1)[k - 1]
+    above = np.flatnonzero(values > kth)
+    ties = np.flatnonzero(values == kth)[: k - len(above)]
+    top_idx = np.concatenate([above, ties])
+    top_idx = top_idx[np.lexsort((top_idx, -values[top_idx]))]
+
     top_features = []
-    for feature, imp in sorted_features[:top_k]:
+    for i in top_idx:
+        feature, imp = names[i], values[i]
         top_features.append({
             "name": feature,
             "importance": float(imp),
@@ -31,24 +52,25 @@ def get_top_features_marl(agent_analyses, top_k=3):
         
     return top_features
 
+# XAI 설명 문장 템플릿 (순위별 문장은 상위 지표 개수만큼 앞에서부터 사용)
+EXPLANATION_HEADER = "AI가 '{}'을 결정한 주된 이유는 다음과 같습니다.\n\n"
+EXPLANATION_RANK_LINES = (
+    "  1. '{}' 지표의 최근 움직임을 가장 중요하게 고려했습니다.\n",
+    "  2. '{}' 지표가 2순위로 결정에 영향을 미쳤습니다.\n",
+    "  3. 마지막으로 '{}' 지표를 참고했습니다.\n",
+)
+
 def generate_ai_explanation(final_signal, agent_analyses):
     """AI 판단 근거(XAI) 텍스트 생성"""
     top_features = get_top_features_marl(agent_analyses)
     
-    explanation = f"AI가 '{final_signal}'을 결정한 주된 이유는 다음과 같습니다.\n\n"
+    explanation = EXPLANATION_HEADER.format(final_signal)
     if not top_features:
         return explanation + "데이터 분석 중입니다."
-        
-    if len(top_features) > 0:
-        explanation += f"  1. '{top_features[0]['name']}' 지표의 최근 움직임을 가장 중요하게 고려했습니다.\n"
-    
-    if len(top_features) > 1:
-        explanation += f"  2. '{top_features[1]['name']}' 지표가 2순위로 결정에 영향을 미쳤습니다.\n"
-        
-    if len(top_features) > 2:
-        explanation += f"  3. 마지막으로 '{top_features[2]['name']}' 지표를 참고했습니다.\n"
-        
-    return explanation
+
+    return explanation + "".join(
+        line.format(feat["name"]) for line, feat in zip(EXPLANATION_RANK_LINES, top_features)
+    )
 
 def print_ui_output(final_signal, ai_explanation, current_indicators, q_total_grid, best_q_total_value, action_names):
     """콘솔에 최종 결과 출력"""
@@ -62,6 +84,6 @@ def print_ui_output(final_signal, ai_explanation, current_indicators, q_total_gr
     print(ai_explanation)
     print("\n--- 3. 주요 지표 현황 ---")
     for k, v in current_indicators.items():
-        if k in ['SMA20', 'RSI', 'MACD', 'VIX']: # 주요 지표만 간략 출력
+        if k in KEY_INDICATORS: # 주요 지표만 간략 출력
             print(f"    - {k:<10}: {v:.2f}")
     print("=============================================")
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""Make stock price (symbol, date) unique
+
+Revision ID: 8c2f4a9e1b37
+Revises: 61e0805dad73
+Create Date: 2025-12-15 10:02:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2f4a9e1b37'
+down_revision: Union[str, Sequence[str], None] = '61e0805dad73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 유니크 인덱스를 만들기 전에 (symbol, date) 중복 행 정리 (가장 먼저 저장된 행만 남김)
+    op.execute(
+        "DELETE FROM stock_prices WHERE id NOT IN "
+        "(SELECT MIN(id) FROM stock_prices GROUP BY symbol, date)"
+    )
+    op.drop_index('idx_stock_price_symbol_date', table_name='stock_prices')
+    op.create_index('idx_stock_price_symbol_date', 'stock_prices', ['symbol', 'date'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_stock_price_symbol_date', table_name='stock_prices')
+    op.create_index('idx_stock_price_symbol_date', 'stock_prices', ['symbol', 'date'], unique=False)
@@ -0,0 +1,48 @@
+"""Add covering indexes for portfolio listings
+
+Revision ID: b5d1e7f3a920
+Revises: 8c2f4a9e1b37
+Create Date: 2025-12-15 11:37:09.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1e7f3a920'
+down_revision: Union[str, Sequence[str], None] = '8c2f4a9e1b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_holdings_portfolio_covering',
+        'holdings',
+        ['portfolio_id', 'symbol', 'quantity', 'avg_price'],
+        unique=False,
+    )
+    op.drop_index('idx_investment_record_portfolio_timestamp', table_name='investment_records')
+    op.create_index(
+        'idx_investment_record_portfolio_timestamp',
+        'investment_records',
+        ['portfolio_id', 'timestamp'],
+        unique=False,
+        postgresql_include=['signal', 'entry_price', 'shares', 'portfolio_value', 'pnl'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_investment_record_portfolio_timestamp', table_name='investment_records')
+    op.create_index(
+        'idx_investment_record_portfolio_timestamp',
+        'investment_records',
+        ['portfolio_id', 'timestamp'],
+        unique=False,
+    )
+    op.drop_index('ix_holdings_portfolio_covering', table_name='holdings')
@@ -0,0 +1,33 @@
+"""Add portfolio/model/timestamp index on investment records
+
+Revision ID: c3f8a1d6e2b4
+Revises: b5d1e7f3a920
+Create Date: 2025-12-16 10:12:44.581907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d6e2b4'
+down_revision: Union[str, Sequence[str], None] = 'b5d1e7f3a920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'idx_investment_record_portfolio_model_timestamp',
+        'investment_records',
+        ['portfolio_id', 'model_type', sa.text('timestamp DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_investment_record_portfolio_model_timestamp', table_name='investment_records')
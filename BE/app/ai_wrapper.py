@@ -1,17 +1,35 @@
 import sys
 import os
+import copy
+import importlib.util
+import pickle
+import threading
+import time
+import traceback
+import zipfile
+from collections import OrderedDict
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 import torch
 import joblib
 from datetime import datetime, timedelta
 import yaml
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml C 파서 (설치되어 있으면 훨씬 빠름)
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 import warnings
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple
 import torch.nn.functional as F 
+from numba import njit
 
 # [중요] 같은 패키지 내 모듈이므로 상대 경로 import 사용
 from .gpt_service import interpret_model_output
+from .signal_cache import TODAY_TTL, signal_cache
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
@@ -25,6 +43,95 @@ AI_DIR = os.path.join(PROJECT_ROOT, "AI")
 A2C_DIR = os.path.join(AI_DIR, "a2c_11.29")
 MARL_DIR = os.path.join(AI_DIR, "marl_3agent")
 
+# 고정 경로의 모델 파일 (로드할 때마다 경로를 다시 조합하지 않도록 import 시 한 번 계산)
+A2C_CONFIG_PATH = os.path.join(A2C_DIR, "config.yaml")
+MARL_SCALERS_JSON_PATH = os.path.join(MARL_DIR, "scalers.json")
+MARL_SCALERS_PATH = os.path.join(MARL_DIR, "scalers.pkl")
+MARL_WEIGHTS_PATH = os.path.join(MARL_DIR, "best_model.pth")
+
+# 모델 파일은 모두 각 모델 디렉토리 기준 절대 경로로 읽음 (os.chdir는 프로세스 전역이라
+# 여러 스레드에서 동시에 로드/예측하면 서로의 작업 디렉토리를 덮어씀)
+# sys.path 수정도 병렬 로드 시 겹칠 수 있으므로 Lock으로 보호
+_SYS_PATH_LOCK = threading.Lock()
+
+
+def _add_to_sys_path(path: str):
+    with _SYS_PATH_LOCK:
+        if path not in sys.path:
+            sys.path.append(path)
+
+
+# 모듈별 Lock (A2C / MARL 병렬 로드 시 서로 다른 모듈은 동시에 import 가능)
+_MODULE_LOCKS: Dict[str, threading.Lock] = {}
+
+
+@lru_cache(maxsize=None)
+def _load_model_module(directory: str, name: str):
+    """
+    모델 디렉토리(A2C_DIR / MARL_DIR)의 모듈을 파일 경로로 한 번만 로드해서 재사용.
+    utils 같은 흔한 이름이 sys.path의 다른 패키지로 잡히지 않도록 경로를 직접 지정하고,
+    아직 같은 이름의 모듈이 없으면 sys.modules에도 등록 (모듈 내부의 `from marl_config import ...`가 같은 객체를 쓰도록)
+    """
+    path = os.path.join(directory, f"{name}.py")
+    with _MODULE_LOCKS.setdefault(path, threading.Lock()):
+        existing = sys.modules.get(name)
+        if existing is not None and getattr(existing, "__file__", None) == path:
+            return existing
+
+        # 다른 파일이 이미 같은 이름으로 로드돼 있으면 덮어쓰지 않고 디렉토리 이름을 붙여 따로 로드
+        module_name = name if existing is None else f"{os.path.basename(directory)}.{name}"
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+        return module
+
+
+def _a2c_module(name: str):
+    return _load_model_module(A2C_DIR, name)
+
+
+def _marl_module(name: str):
+    return _load_model_module(MARL_DIR, name)
+
+
+@lru_cache(maxsize=8)
+def _load_yaml_cached(path: str, mtime: float):
+    """
+    YAML 설정 파일 파싱 결과 캐시 ((경로, 수정 시각) 기준 → 파일이 바뀌면 다시 파싱)
+    여러 곳에서 공유하므로 최상위는 읽기 전용 매핑으로 반환
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return MappingProxyType(yaml.load(f, Loader=_YamlLoader))
+
+
+def load_yaml_config(path: str):
+    return _load_yaml_cached(path, os.path.getmtime(path))
+
+
+# 작은 MLP 추론에는 intra-op 스레드가 여러 개일 필요가 없고,
+# 예측 스레드 풀의 워커들과 CPU를 두고 경쟁하므로 기본 1개로 제한
+torch.set_num_threads(int(os.getenv("TORCH_NUM_THREADS", "1")))
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # 이미 병렬 작업이 시작된 뒤에는 변경 불가 (다른 모듈이 먼저 torch를 사용한 경우)
+    pass
+
+
+# 행동 ID(0=매수, 1=매도, 2=관망) -> 포지션 (전략 수익률 계산용)
+POSITION_BY_ACTION = MappingProxyType({0: 1.0, 1: -1.0, 2: 0.0})
+
+# MARL 에이전트 행동 ID -> 의미 (convert_joint_action_to_signal 입력)
+MARL_ACTION_MAP = MappingProxyType({0: "Long", 1: "Hold", 2: "Short"})
+
+# MARL 최종 신호 문자열 -> 행동 ID (목록에 없으면 2=관망)
+MARL_SIGNAL_TO_ACTION = MappingProxyType({"매수": 0, "적극 매수": 0, "매도": 1, "적극 매도": 1})
+
 
 # ==================================================================================
 # 1. 공통 유틸리티 (Action Selection Logic)
@@ -40,10 +147,10 @@ def _select_action_from_logits(
     Logits -> Softmax(Temperature) -> Action 선택
     """
     probs = torch.nn.functional.softmax(logits / temperature, dim=-1).detach().cpu().numpy()[0]
-    sorted_probs = np.sort(probs)[::-1]
+    # 전체 정렬 없이 1등/2등 확률만 구함 (반환값과 샘플링에 확률 벡터가 필요하므로 softmax는 유지)
     top_idx = int(np.argmax(probs))
-    max_p = float(sorted_probs[0])
-    second_p = float(sorted_probs[1]) if len(sorted_probs) > 1 else 0.0
+    max_p = float(probs[top_idx])
+    second_p = float(np.partition(probs, -2)[-2]) if len(probs) > 1 else 0.0
 
     if (max_p < min_conf) or (max_p - second_p < min_margin):
         return 2, probs 
@@ -55,160 +162,362 @@ def _select_action_from_logits(
     return top_idx, probs
 
 
+def _cpu_supports_bf16() -> bool:
+    """AVX512-BF16 또는 AMX를 지원하는 CPU인지 확인 (지원 안 하면 bf16이 오히려 느림)"""
+    for check in ("_is_avx512_bf16_supported", "_is_amx_tile_supported"):
+        fn = getattr(torch.cpu, check, None)
+        if fn is not None and fn():
+            return True
+    return False
+
+
+# 시그니처를 명시해서 import 시점에 컴파일 (cache=True라 이후 실행은 디스크 캐시에서 로드)
+# → 첫 요청에서 타입 추론/JIT 컴파일이 일어나지 않고, 잘못된 dtype/레이아웃 입력은 바로 TypeError
+@njit("float32[::1](float32[:, ::1], float32)", cache=True, fastmath=True, boundscheck=False)
+def _build_state_numba(window, position_flag):
+    """
+    data_utils.build_state와 같은 상태 벡터 생성 (window 평탄화 + 포지션 플래그).
+
+    Args:
+        window: (window_size, len(FEATURES)) C-contiguous float32 배열
+        position_flag: 포지션 플래그 (0 = 무포지션)
+    """
+    rows, cols = window.shape
+    state = np.empty(rows * cols + 1, dtype=np.float32)
+    for i in range(rows):
+        for j in range(cols):
+            state[i * cols + j] = window[i, j]
+    state[rows * cols] = position_flag
+    return state
+
+
 # ==================================================================================
 # 2. A2C Wrapper
 # ==================================================================================
 class A2CWrapper:
+    # 다운로드한 시세/지표 데이터를 재사용하는 시간(초). 지나면 다음 요청에서 다시 다운로드
+    FRAME_CACHE_TTL = float(os.getenv("A2C_FRAME_CACHE_TTL", "60"))
+    # bf16/int8 추론 네트워크를 쓰기 위한 최소 행동 일치율 (SHAP 배경 상태 기준)
+    INFERENCE_PARITY_MIN = 0.99
+
     def __init__(self):
         self.model_loaded = False
         self.agent = None
         self.cfg = None
         self.scaler = None
+        # StandardScaler의 평균/표준편차 (transform을 거치지 않고 직접 (X - mean) / scale 계산)
+        self.scaler_mean: Optional[np.ndarray] = None
+        self.scaler_scale: Optional[np.ndarray] = None
         self.explainer = None
         self.feature_names = None
 
+        # 추론 전용 네트워크 (SHAP 설명은 항상 fp32 원본 self.agent.ac_net 사용)
+        self.infer_net = None
+        self.infer_dtype = torch.float32
+        self.infer_mode = "float32"
+
         # Caching
         self.cached_prediction = None
         self.cached_date = None
 
+        # 다운로드 + 지표 계산 + 스케일링 결과 캐시: (시작일, 종료일) -> (저장 시각, (raw_df, df, feats))
+        # 예측 스레드 풀에서 동시에 호출되므로 Lock으로 보호 (같은 구간을 중복 다운로드하지 않음)
+        self._frame_cache: Dict[Tuple[str, str], Tuple[float, Tuple[pd.DataFrame, pd.DataFrame, np.ndarray]]] = {}
+        self._frame_lock = threading.Lock()
+
+        # 콜드 스타트 시 여러 요청이 동시에 load_model을 호출해도 실제 로드는 한 번만 수행
+        # (_load_done: 로드 시도가 끝까지 진행됨 → SHAP 설정 중인 모델을 다른 스레드가 쓰지 않도록 model_loaded와 분리)
+        self._load_lock = threading.Lock()
+        self._load_done = False
+
         self._setup_path()
 
     def _setup_path(self):
-        if A2C_DIR not in sys.path:
-            sys.path.append(A2C_DIR)
+        _add_to_sys_path(A2C_DIR)
 
-    def load_model(self):
-        if self.model_loaded:
+    def _load_scaler_npz(self, path: str, features: List[str]) -> bool:
+        """scaler_io로 저장한 npz에서 mean/scale 로드. 파일이 없거나 피처 순서가 FEATURES와 다르면 False"""
+        try:
+            mean, scale, names = _a2c_module("scaler_io").load_scaler_npz(path)
+        except FileNotFoundError:
+            return False
+        if (names and names != list(features)) or len(mean) != len(features):
+            print(f"[A2C] Warning: {path} does not match FEATURES, falling back to joblib")
+            return False
+
+        self.scaler_mean = mean
+        self.scaler_scale = scale
+        return True
+
+    def _set_scaler_params(self, features: List[str]):
+        """
+        StandardScaler면 mean_/scale_을 꺼내 둠. 학습 시 피처 순서가 FEATURES와 다르거나
+        다른 종류의 스케일러면 None으로 두고 scaler.transform을 그대로 사용.
+        """
+        self.scaler_mean = None
+        self.scaler_scale = None
+
+        names = getattr(self.scaler, "feature_names_in_", None)
+        if names is not None and list(names) != list(features):
+            return
+        if type(self.scaler).__name__ != "StandardScaler":
             return
 
-        original_cwd = os.getcwd()
-        os.chdir(A2C_DIR)
+        n = len(features)
+        mean = self.scaler.mean_ if self.scaler.with_mean else None
+        scale = self.scaler.scale_ if self.scaler.with_std else None
+        self.scaler_mean = np.zeros(n) if mean is None else np.asarray(mean, dtype=np.float64)
+        self.scaler_scale = np.ones(n) if scale is None else np.asarray(scale, dtype=np.float64)
+
+    def _setup_inference_net(self, mode: Optional[str] = None):
+        """
+        예측용 네트워크 준비 (mode 기본값: 환경변수 A2C_INFERENCE_DTYPE).
+        - bfloat16: CPU가 bf16 연산을 지원하면 bf16 복사본으로 추론
+        - int8: Linear 가중치를 int8로 동적 양자화한 복사본으로 추론
+        - 그 외: fp32 원본을 그대로 사용
+        준비한 네트워크는 torch.jit.trace로 고정.
+        """
+        mode = (mode or os.getenv("A2C_INFERENCE_DTYPE", "float32")).lower()
+        self.infer_net = self.agent.ac_net.eval()
+        self.infer_dtype = torch.float32
+        self.infer_mode = "float32"
+
+        if mode == "bfloat16":
+            if _cpu_supports_bf16():
+                self.infer_net = copy.deepcopy(self.agent.ac_net).to(torch.bfloat16).eval()
+                self.infer_dtype = torch.bfloat16
+                self.infer_mode = "bfloat16"
+                print("[A2C] Using bfloat16 inference network")
+            else:
+                print("[A2C] bfloat16 requested but not supported by this CPU, using float32")
+        elif mode == "int8":
+            self.infer_net = torch.ao.quantization.quantize_dynamic(
+                copy.deepcopy(self.agent.ac_net).eval(), {torch.nn.Linear}, dtype=torch.qint8
+            )
+            self.infer_mode = "int8"
+            print("[A2C] Using int8 dynamic-quantized inference network")
 
+        # 입력 크기가 (1, state_dim)으로 고정이므로 한 번 trace해서 파이썬 모듈 호출 오버헤드 제거,
+        # freeze로 가중치를 상수로 고정해 Linear+ReLU 등을 융합 (학습하지 않으므로 파라미터 갱신 불필요)
+        state_dim = self.agent.ac_net.feature_layer[0].in_features
+        example = torch.zeros(1, state_dim, dtype=self.infer_dtype)
         try:
-            import ac_model
-            import data_utils
-            import explain_a2c
-
-            # Load Config
-            with open("config.yaml", "r", encoding="utf-8") as f:
-                self.cfg = yaml.safe_load(f)
+            with torch.inference_mode():
+                traced = torch.jit.trace(self.infer_net, example)
+            self.infer_net = torch.jit.freeze(traced)
+            with torch.inference_mode():
+                # 첫 호출 시 일어나는 그래프 최적화/특수화를 미리 수행
+                self.infer_net(example)
+        except Exception as e:
+            print(f"[A2C] TorchScript trace/freeze failed, using eager network: {e}")
+
+    def _check_inference_parity(self, states: np.ndarray):
+        """
+        bf16/int8 추론 네트워크가 fp32 원본과 같은 행동(argmax)을 고르는지 확인하고,
+        일치율이 INFERENCE_PARITY_MIN 미만이면 fp32 네트워크로 되돌림
+        """
+        if self.infer_mode == "float32" or len(states) == 0:
+            return
 
-            # Load Scaler
-            scaler_path = os.path.join(self.cfg["report_dir"], "scaler.joblib")
-            if os.path.exists(scaler_path):
-                self.scaler = joblib.load(scaler_path)
-            else:
-                print(f"[A2C] Warning: Scaler not found at {scaler_path}")
+        with torch.inference_mode():
+            expected = self.agent.ac_net(torch.from_numpy(states))[0].argmax(dim=-1)
+            actual = torch.cat([self._policy_logits(s) for s in states]).argmax(dim=-1)
+        agreement = (expected == actual).float().mean().item()
+
+        print(f"[A2C] {self.infer_mode} action agreement with float32: {agreement:.3f}")
+        if agreement < self.INFERENCE_PARITY_MIN:
+            print(f"[A2C] {self.infer_mode} agreement below {self.INFERENCE_PARITY_MIN}, using float32")
+            self._setup_inference_net("float32")
+
+    def _policy_logits_batch(self, states: np.ndarray) -> torch.Tensor:
+        """(B, state_dim) 상태 배치에 대한 정책 logits (fp32로 반환). torch.inference_mode() 안에서 호출"""
+        s_t = torch.from_numpy(states)
+        if self.infer_dtype is not torch.float32:
+            s_t = s_t.to(self.infer_dtype)
+        logits, _ = self.infer_net(s_t)
+        return logits.float()
+
+    def _policy_logits(self, state: np.ndarray) -> torch.Tensor:
+        """상태 벡터 하나에 대한 정책 logits (fp32로 반환). torch.inference_mode() 안에서 호출"""
+        s_t = torch.from_numpy(state).unsqueeze_(0)
+        if self.infer_dtype is not torch.float32:
+            s_t = s_t.to(self.infer_dtype)
+        logits, _ = self.infer_net(s_t)
+        return logits.float()
+
+    def _get_frames(self, start_str: str, end_str: str) -> Tuple[pd.DataFrame, pd.DataFrame, np.ndarray]:
+        """
+        download_data + add_indicators + scaler.transform 결과를 구간별로 FRAME_CACHE_TTL초 동안 캐시해서 반환.
+        반환: (raw_df, df, feats)
+        - feats: df[FEATURES]의 C-contiguous float32 배열 (행 슬라이스를 그대로 상태 벡터 생성에 사용)
+        반환된 DataFrame/배열은 여러 요청이 공유하므로 호출 측에서 수정하면 안 됨.
+        """
+        key = (start_str, end_str)
+        with self._frame_lock:
+            now = time.monotonic()
+            cached = self._frame_cache.get(key)
+            if cached is not None and now - cached[0] < self.FRAME_CACHE_TTL:
+                return cached[1]
+
+            data_utils = _a2c_module("data_utils")
+            FEATURES = data_utils.FEATURES
 
-            # Initialize Agent
-            model_cfg = self.cfg["model_cfg"]
-            window_size = self.cfg["window_size"]
-            dummy_state_dim = len(data_utils.FEATURES) * window_size + 1
-
-            self.agent = ac_model.A2CAgent(
-                state_dim=dummy_state_dim,
-                action_dim=3,
-                hidden_dims=model_cfg.get("hidden_dims", [128, 128]),
-                gamma=self.cfg["gamma"],
-                lr=self.cfg["lr"],
-                value_loss_coeff=self.cfg["value_loss_coeff"],
-                entropy_coeff=self.cfg["entropy_coeff"],
-                seed=self.cfg["seed"],
-                device=self.cfg.get("device", "cpu"),
+            raw_df = data_utils.download_data(
+                self.cfg["ticker"],
+                self.cfg["kospi_ticker"],
+                self.cfg["vix_ticker"],
+                start_str,
+                end_str,
             )
+            df = data_utils.add_indicators(raw_df)
 
-            # Load weights
-            model_path = self.cfg["model_path"]
-            loaded_model = False
-            if os.path.exists(model_path):
-                try:
-                    self.agent.load(model_path)
-                    loaded_model = True
-                    print(f"[A2C] Loaded weights from {model_path}")
-                except Exception as e:
-                    print(f"[A2C] Error loading weights from {model_path}: {e}")
+            if self.scaler_mean is not None:
+                # sklearn transform의 입력 검증/DataFrame 변환 없이 같은 식을 새로 꺼낸 배열 위에서 in-place 적용,
+                # DataFrame에 다시 쓰고 같은 배열에서 바로 float32 피처 배열 생성 (DataFrame에서 한 번 더 꺼내지 않음)
+                scaled = df[FEATURES].to_numpy(dtype=np.float64, copy=True)
+                scaled -= self.scaler_mean
+                scaled /= self.scaler_scale
+                df[FEATURES] = scaled
+                feats = scaled.astype(np.float32, order="C")
             else:
-                print(f"[A2C] Warning: Model not found at {model_path}")
+                if self.scaler is not None:
+                    df[FEATURES] = self.scaler.transform(df[FEATURES])
+                else:
+                    print("[A2C] Warning: scaler is None. Using unscaled features may degrade performance.")
+                feats = np.ascontiguousarray(df[FEATURES].to_numpy(dtype=np.float32))
+
+            # 만료됐거나 날짜가 바뀌어 더 이상 쓰지 않는 이전 종료일 기준 데이터는 정리
+            self._frame_cache = {
+                k: v for k, v in self._frame_cache.items()
+                if k[1] == end_str and now - v[0] < self.FRAME_CACHE_TTL
+            }
+            self._frame_cache[key] = (now, (raw_df, df, feats))
+            return raw_df, df, feats
+
+    def load_model(self):
+        if self._load_done:
+            return
 
-            if not loaded_model:
-                self.model_loaded = False
+        with self._load_lock:
+            if self._load_done:
                 return
+            try:
+                self._load_model()
+            finally:
+                self._load_done = self.model_loaded
+
+    def _load_model(self):
+        ac_model = _a2c_module("ac_model")
+        data_utils = _a2c_module("data_utils")
+        explain_a2c = _a2c_module("explain_a2c")
+
+        # Load Config
+        self.cfg = load_yaml_config(A2C_CONFIG_PATH)
+
+        # Load Scaler (mean/scale 배열만 담은 npz 우선, 없거나 피처가 맞지 않으면 joblib)
+        report_dir = os.path.join(A2C_DIR, self.cfg["report_dir"])
+        scaler_npz_path = os.path.join(report_dir, "scaler.npz")
+        scaler_path = os.path.join(report_dir, "scaler.joblib")
+        # (exists 확인 후 로드하지 않고 바로 열어서 FileNotFoundError로 처리 → stat 한 번 덜 하고 경쟁 상태 없음)
+        if not self._load_scaler_npz(scaler_npz_path, data_utils.FEATURES):
+            try:
+                self.scaler = joblib.load(scaler_path)
+                self._set_scaler_params(data_utils.FEATURES)
+            except FileNotFoundError:
+                print(f"[A2C] Warning: Scaler not found at {scaler_path}")
 
-            self.model_loaded = True
+        # Initialize Agent
+        model_cfg = self.cfg["model_cfg"]
+        window_size = self.cfg["window_size"]
+        dummy_state_dim = len(data_utils.FEATURES) * window_size + 1
+
+        self.agent = ac_model.A2CAgent(
+            state_dim=dummy_state_dim,
+            action_dim=3,
+            hidden_dims=model_cfg.get("hidden_dims", [128, 128]),
+            gamma=self.cfg["gamma"],
+            lr=self.cfg["lr"],
+            value_loss_coeff=self.cfg["value_loss_coeff"],
+            entropy_coeff=self.cfg["entropy_coeff"],
+            seed=self.cfg["seed"],
+            device=self.cfg.get("device", "cpu"),
+        )
+
+        # Load weights
+        model_path = os.path.join(A2C_DIR, self.cfg["model_path"])
+        loaded_model = False
+        try:
+            self.agent.load(model_path, mmap=True)
+            loaded_model = True
+            print(f"[A2C] Loaded weights from {model_path}")
+        except FileNotFoundError:
+            print(f"[A2C] Warning: Model not found at {model_path}")
+        except Exception as e:
+            print(f"[A2C] Error loading weights from {model_path}: {e}")
 
-            # --- SHAP Setup ---
-            import shap
+        if not loaded_model:
+            self.model_loaded = False
+            return
 
-            end_dt = datetime.now()
-            start_dt = end_dt - timedelta(days=365 * 2)
+        self.model_loaded = True
+        self._setup_inference_net()
 
-            raw_df = data_utils.download_data(
-                self.cfg["ticker"],
-                self.cfg["kospi_ticker"],
-                self.cfg["vix_ticker"],
-                start_dt.strftime("%Y-%m-%d"),
-                end_dt.strftime("%Y-%m-%d"),
-            )
-            df = data_utils.add_indicators(raw_df)
-            if self.scaler:
-                df[data_utils.FEATURES] = self.scaler.transform(df[data_utils.FEATURES])
-
-            bg_states = []
-            bg_len = min(200 + window_size, len(df) - 1)
-            for i in range(window_size - 1, bg_len):
-                current_window = df.iloc[i - (window_size - 1): i + 1]
-                s = data_utils.build_state(current_window, position_flag=0)
-                bg_states.append(s)
-            bg_states = np.array(bg_states, dtype=np.float32)
-
-            if len(bg_states) > 100:
-                bg_summary = shap.sample(bg_states, 100)
-            else:
-                bg_summary = bg_states
+        # --- SHAP Setup ---
+        import shap
 
-            def model_f(x):
-                x_t = torch.tensor(x, dtype=torch.float32, device=self.cfg.get("device", "cpu"))
-                policy_logits, _ = self.agent.ac_net(x_t)
-                policy_probs = torch.nn.functional.softmax(policy_logits, dim=-1)
-                return policy_probs.detach().cpu().numpy()
+        end_dt = datetime.now()
+        start_dt = end_dt - timedelta(days=365 * 2)
 
-            self.explainer = shap.KernelExplainer(model_f, bg_summary)
-            self.feature_names = explain_a2c.get_feature_names_with_position(window_size)
+        _, df, feats = self._get_frames(start_dt.strftime("%Y-%m-%d"), end_dt.strftime("%Y-%m-%d"))
+
+        bg_states = []
+        bg_len = min(200 + window_size, len(df) - 1)
+        for i in range(window_size - 1, bg_len):
+            s = _build_state_numba(feats[i - (window_size - 1): i + 1], 0.0)
+            bg_states.append(s)
+        bg_states = np.array(bg_states, dtype=np.float32)
+        self._check_inference_parity(bg_states)
+
+        if len(bg_states) > 100:
+            bg_summary = shap.sample(bg_states, 100)
+        else:
+            bg_summary = bg_states
+
+        def model_f(x):
+            x_t = torch.tensor(x, dtype=torch.float32, device=self.cfg.get("device", "cpu"))
+            policy_logits, _ = self.agent.ac_net(x_t)
+            policy_probs = torch.nn.functional.softmax(policy_logits, dim=-1)
+            return policy_probs.detach().cpu().numpy()
+
+        self.explainer = shap.KernelExplainer(model_f, bg_summary)
+        self.feature_names = explain_a2c.get_feature_names_with_position(window_size)
 
-        finally:
-            os.chdir(original_cwd)
 
     def get_historical_signals(self, start_date_str: str):
+        # 어제까지의 결과라 같은 날 동안은 바뀌지 않음 → 디스크 캐시를 하루 동안 사용
+        cached = signal_cache.get("a2c", start_date_str)
+        if cached is not None:
+            return cached
+
+        results = self._compute_historical_signals(start_date_str)
+        if results:
+            signal_cache.set("a2c", start_date_str, results)
+        return results
+
+    def _compute_historical_signals(self, start_date_str: str):
         self.load_model()
         if not self.model_loaded:
             return []
 
-        original_cwd = os.getcwd()
-        os.chdir(A2C_DIR)
-
         debug_samples = []  
         try:
-            from data_utils import download_data, add_indicators, FEATURES, build_state
-
             window_size = self.cfg["window_size"]
             start_dt = datetime.strptime(start_date_str, "%Y-%m-%d")
             data_start = (start_dt - timedelta(days=180)).strftime("%Y-%m-%d")
             end_dt = datetime.now()
             data_end = end_dt.strftime("%Y-%m-%d")
 
-            raw_df = download_data(
-                self.cfg["ticker"],
-                self.cfg["kospi_ticker"],
-                self.cfg["vix_ticker"],
-                data_start,
-                data_end,
-            )
-            df = add_indicators(raw_df)
-
-            if self.scaler is not None:
-                df[FEATURES] = self.scaler.transform(df[FEATURES])
-            else:
-                print("[A2C] Warning: scaler is None. Using unscaled features may degrade performance.")
+            raw_df, df, feats = self._get_frames(data_start, data_end)
 
             results: List[Dict[str, Any]] = []
             cumulative_return = 0.0 
@@ -216,9 +525,10 @@ class A2CWrapper:
             target_date = start_dt
             yesterday = end_dt - timedelta(days=1)
 
+            # 1) 대상 날짜와 상태 벡터를 먼저 모두 모음
+            targets = []
+            states = []
             while target_date <= yesterday:
-                date_str = target_date.strftime("%Y-%m-%d")
-
                 if target_date not in df.index:
                     target_date += timedelta(days=1)
                     continue
@@ -233,22 +543,31 @@ class A2CWrapper:
                     target_date += timedelta(days=1)
                     continue
 
-                prev_window = df.iloc[
-                    prev_date_loc - (window_size - 1): prev_date_loc + 1
-                ]
-                state = build_state(prev_window, position_flag=0)
+                targets.append(target_date)
+                states.append(_build_state_numba(
+                    feats[prev_date_loc - (window_size - 1): prev_date_loc + 1], 0.0
+                ))
 
-                with torch.no_grad():
-                    s_t = torch.tensor(state, dtype=torch.float32).unsqueeze(0)
-                    logits, _ = self.agent.ac_net(s_t)
-                    
-                    action, probs = _select_action_from_logits(
-                        logits,
-                        temperature=0.8,
-                        min_conf=0.45,
-                        min_margin=0.10,
-                        sample=True,
-                    )
+                target_date += timedelta(days=1)
+
+            if not states:
+                return results
+
+            # 2) 전체 기간을 (날짜 수, state_dim) 배치 한 번으로 추론
+            with torch.inference_mode():
+                all_logits = self._policy_logits_batch(np.stack(states))
+
+            # 3) 날짜 순서대로 행동 선택 + 수익률 누적 (샘플링 순서는 기존과 동일)
+            for i, target_date in enumerate(targets):
+                date_str = target_date.strftime("%Y-%m-%d")
+
+                action, probs = _select_action_from_logits(
+                    all_logits[i:i + 1],
+                    temperature=0.8,
+                    min_conf=0.45,
+                    min_margin=0.10,
+                    sample=True,
+                )
 
                 if len(debug_samples) < 5:
                     debug_samples.append({"date": date_str, "probs": probs.tolist(), "action": action})
@@ -257,7 +576,7 @@ class A2CWrapper:
                 prev_price = raw_df.iloc[raw_df.index.get_loc(target_date) - 1]["Close"]
                 daily_pct_change = (curr_price - prev_price) / prev_price
 
-                pos = {0: 1.0, 1: -1.0, 2: 0.0}[action] 
+                pos = POSITION_BY_ACTION[action]
                 strategy_daily = pos * daily_pct_change
                 cumulative_return = (1 + cumulative_return) * (1 + strategy_daily) - 1
 
@@ -270,8 +589,6 @@ class A2CWrapper:
                     }
                 )
 
-                target_date += timedelta(days=1)
-
             if debug_samples:
                 print(f"[A2C] debug (first 5): {debug_samples}")
 
@@ -279,11 +596,8 @@ class A2CWrapper:
 
         except Exception as e:
             print(f"Error in A2C historical signals: {e}")
-            import traceback
             traceback.print_exc()
             return []
-        finally:
-            os.chdir(original_cwd)
 
     def predict_today(self):
         # 1. Check Cache
@@ -296,42 +610,25 @@ class A2CWrapper:
         if not self.model_loaded:
             raise RuntimeError("A2C model is not loaded. Check model_path in config.yaml.")
 
-        original_cwd = os.getcwd()
-        os.chdir(A2C_DIR)
-
         try:
-            from data_utils import download_data, add_indicators, FEATURES, build_state
-            import explain_a2c
+            explain_a2c = _a2c_module("explain_a2c")
 
             end_dt = datetime.now()
             start_dt = end_dt - timedelta(days=100)
 
-            raw_df = download_data(
-                self.cfg["ticker"],
-                self.cfg["kospi_ticker"],
-                self.cfg["vix_ticker"],
-                start_dt.strftime("%Y-%m-%d"),
-                end_dt.strftime("%Y-%m-%d"),
-            )
-            df = add_indicators(raw_df)
-
-            if self.scaler is not None:
-                df[FEATURES] = self.scaler.transform(df[FEATURES])
-            else:
-                print("[A2C] Warning: scaler is None. Using unscaled features may degrade performance.")
+            raw_df, df, feats = self._get_frames(start_dt.strftime("%Y-%m-%d"), end_dt.strftime("%Y-%m-%d"))
 
             window_size = self.cfg["window_size"]
             if len(df) < window_size:
                 return None
 
-            last_window = df.iloc[-window_size:]
             last_date = df.index[-1]
 
-            state = build_state(last_window, position_flag=0)
+            # 캐시된 float32 피처 배열의 마지막 window_size 행으로 바로 상태 생성 (DataFrame 슬라이스/복사 없음)
+            state = _build_state_numba(feats[-window_size:], 0.0)
 
-            with torch.no_grad():
-                s_t = torch.tensor(state, dtype=torch.float32).unsqueeze(0)
-                logits, _ = self.agent.ac_net(s_t)
+            with torch.inference_mode():
+                logits = self._policy_logits(state)
                 
                 action, probs = _select_action_from_logits(
                     logits,
@@ -347,21 +644,18 @@ class A2CWrapper:
             )
 
             # Top-3 지표에 현재 값(value) 주입
+            # (마지막 행을 한 번에 파이썬 float dict로 변환, 원본 컬럼은 raw_df 값 우선)
             try:
-                last_row = last_window.iloc[-1]
+                last_values = dict(zip(df.columns, df.iloc[-1:].to_numpy(np.float64)[0].tolist()))
+                raw_values = dict(zip(raw_df.columns, raw_df.iloc[-1:].to_numpy(np.float64)[0].tolist()))
                 for feat in top_features:
                     if not isinstance(feat, dict): continue
                     
                     base_name = (
                         feat.get("base") or feat.get("name") or feat.get("indicator")
                     )
-                    if base_name and base_name in last_row.index:
-                        try:
-                            if base_name in raw_df.columns:
-                                feat["value"] = float(raw_df.iloc[-1][base_name])
-                            else:
-                                feat["value"] = float(last_row[base_name])
-                        except: pass
+                    if base_name and base_name in last_values:
+                        feat["value"] = raw_values.get(base_name, last_values[base_name])
             except: pass
 
             print(f"[A2C] predict_today probs={probs.tolist()} action={action}")
@@ -382,8 +676,6 @@ class A2CWrapper:
         except Exception as e:
             print(f"Error in A2C predict_today: {e}")
             return None
-        finally:
-            os.chdir(original_cwd)
 
 
 # ==================================================================================
@@ -405,32 +697,95 @@ class MarlWrapper:
         self.cached_prediction = None
         self.cached_date = None
 
+        # 동시에 들어온 요청들이 각각 데이터 다운로드/가중치 로드를 반복하지 않도록 보호
+        self._load_lock = threading.Lock()
+
+        # 히스토리 추론용 autocast dtype (None이면 fp32 그대로)
+        self.amp_dtype = None
+        # 히스토리 추론용 에이전트 Q-Net (trace+freeze된 복사본 또는 eager 원본)
+        self.infer_nets = None
+
         self._setup_path()
 
     def _setup_path(self):
-        if MARL_DIR not in sys.path:
-            sys.path.append(MARL_DIR)
+        _add_to_sys_path(MARL_DIR)
+
+    def _setup_amp(self):
+        """
+        히스토리 추론용 혼합 정밀도 설정 (환경변수 MARL_AMP_DTYPE: auto / bfloat16 / float16 / float32).
+        GPU에서만 사용: auto면 bf16 지원 시 bf16, 아니면 fp16.
+        CPU는 autocast 변환 비용이 더 커서 항상 fp32.
+        """
+        mode = os.getenv("MARL_AMP_DTYPE", "auto").lower()
+        self.amp_dtype = None
+        if torch.device(self.learner.dvc).type != "cuda" or mode == "float32":
+            return
+
+        if mode == "float16":
+            self.amp_dtype = torch.float16
+        elif mode in ("auto", "bfloat16") and torch.cuda.is_bf16_supported():
+            self.amp_dtype = torch.bfloat16
+        else:
+            self.amp_dtype = torch.float16
+        print(f"[MARL] Using {self.amp_dtype} autocast for history inference")
+
+    def _setup_inference_nets(self, obs_dims: List[int]):
+        """
+        히스토리 추론용 Q-Net을 torch.jit.trace + freeze로 고정 (A2C 추론 네트워크와 같은 방식).
+        (1, obs_dim) 입력의 작은 MLP라 연산보다 레이어별 파이썬 호출 비용이 커서 trace 효과가 큼.
+        predict_today의 XAI는 입력 gradient가 필요하므로 agent.q_net(eager)을 그대로 사용.
+        autocast를 쓰는 경우(GPU)는 TorchScript와 섞지 않고 eager 그대로 사용.
+        """
+        self.infer_nets = [agent.q_net for agent in self.learner.agents]
+        if self.amp_dtype is not None:
+            return
+
+        traced_nets = []
+        try:
+            for net, dim in zip(self.infer_nets, obs_dims):
+                example = torch.zeros(1, dim, device=self.learner.dvc)
+                with torch.inference_mode():
+                    traced = torch.jit.trace(net.eval(), example)
+                frozen = torch.jit.freeze(traced)
+                with torch.inference_mode():
+                    # 첫 호출 시 일어나는 그래프 최적화/특수화를 미리 수행
+                    frozen(example)
+                traced_nets.append(frozen)
+        except Exception as e:
+            print(f"[MARL] TorchScript trace/freeze failed, using eager networks: {e}")
+            return
+        self.infer_nets = traced_nets
+
+    def _autocast(self):
+        if self.amp_dtype is None:
+            return nullcontext()
+        return torch.autocast(device_type="cuda", dtype=self.amp_dtype)
 
     def load_model(self):
         if self.model_loaded: return
 
-        original_cwd = os.getcwd()
-        os.chdir(MARL_DIR)
+        with self._load_lock:
+            if self.model_loaded: return
+            self._load_model()
 
+    def _load_model(self):
         try:
-            import marl_config as config
-            from qmix_model import QMIX_Learner
-            from environment import MARLStockEnv
-            import pickle
-            from data_processor import DataProcessor
+            config = _marl_module("marl_config")
+            QMIX_Learner = _marl_module("qmix_model").QMIX_Learner
+            MARLStockEnv = _marl_module("environment").MARLStockEnv
+            DataProcessor = _marl_module("data_processor").DataProcessor
 
             today_str = datetime.now().strftime("%Y-%m-%d")
             self.processor = DataProcessor(end=today_str)
             (features_df, prices_df, _, self.a0_cols, self.a1_cols, self.a2_cols) = self.processor.process()
 
-            if os.path.exists("scalers.pkl"):
-                with open("scalers.pkl", "rb") as f:
-                    self.processor.scalers = pickle.load(f)
+            # JSON(변환 파라미터만 저장) 우선 → pickle 역직렬화/sklearn 객체 복원 없이 로드
+            if not self.processor.load_scalers_json(MARL_SCALERS_JSON_PATH):
+                try:
+                    with open(MARL_SCALERS_PATH, "rb") as f:
+                        self.processor.scalers = pickle.load(f)
+                except FileNotFoundError:
+                    print(f"[MARL] Warning: Scalers not found at {MARL_SCALERS_PATH}")
             
             norm_features, _ = self.processor.normalize_data(features_df, features_df)
             
@@ -446,31 +801,65 @@ class MarlWrapper:
                 config.DEVICE,
             )
 
-            if os.path.exists("best_model.pth"):
-                self.learner.load_state_dict(torch.load("best_model.pth", map_location=config.DEVICE))
-                self.learner.agents[0].q_net.eval()
-                self.model_loaded = True
-                print("[MARL] Model loaded successfully.")
-            else:
+            # 메모리 매핑으로 열고 CPU 텐서에서 바로 파라미터로 복사 (체크포인트 전체를 힙에 읽어 두지 않음)
+            # weights_only=True: 텐서/기본 타입만 복원 (임의 객체 unpickle 없음)
+            # mmap은 zip 형식(PyTorch 1.6+ 기본) 체크포인트만 가능 → 구형식이면 일반 로드
+            # (파일이 없으면 is_zipfile은 False, torch.load는 FileNotFoundError)
+            use_mmap = zipfile.is_zipfile(MARL_WEIGHTS_PATH)
+            try:
+                state_dict = torch.load(MARL_WEIGHTS_PATH, map_location="cpu", mmap=use_mmap, weights_only=True)
+            except FileNotFoundError:
                 print("[MARL] Warning: best_model.pth not found.")
+                return
+
+            self.learner.load_state_dict(state_dict)
+            # 모든 에이전트 Q-Net + Mixer를 eval 모드로 (Dropout 비활성화 → 추론 결과가 요청마다 흔들리지 않음)
+            self.learner.eval()
+            self._setup_amp()
+            self._setup_inference_nets(
+                [dummy_env.observation_dim_0, dummy_env.observation_dim_1, dummy_env.observation_dim_2]
+            )
+            self.model_loaded = True
+            print("[MARL] Model loaded successfully.")
 
         except Exception as e:
             print(f"[MARL] Model load failed: {e}")
-        finally:
-            os.chdir(original_cwd)
+
+    def _q_values_batch(self, obs_batches: List[np.ndarray]) -> List[np.ndarray]:
+        """
+        에이전트별 (날짜 수, obs_dim) float32 배열 → 에이전트별 (날짜 수, action_dim) Q값 (fp32 numpy).
+        torch.inference_mode() 안에서 호출
+        """
+        dvc = torch.device(self.learner.dvc)
+        q_batches = []
+        with self._autocast():
+            for net, obs in zip(self.infer_nets, obs_batches):
+                # from_numpy는 복사 없이 버퍼를 공유 (CPU면 그대로 입력, CUDA면 한 번에 전송)
+                x = torch.from_numpy(obs).to(dvc, non_blocking=True)
+                # autocast 출력(bf16/fp16)은 softmax 전에 fp32로 (샘플링 확률 합이 1이 되도록)
+                q_batches.append(net(x).float())
+        return q_batches
 
     def get_historical_signals(self, start_date_str: str):
+        # 오늘 데이터까지 포함하므로 짧은 TTL 적용
+        cached = signal_cache.get("marl", start_date_str, ttl=TODAY_TTL)
+        if cached is not None:
+            return cached
+
+        results = self._compute_historical_signals(start_date_str)
+        if results:
+            signal_cache.set("marl", start_date_str, results)
+        return results
+
+    def _compute_historical_signals(self, start_date_str: str):
         self.load_model()
         if not self.model_loaded: return []
 
-        original_cwd = os.getcwd()
-        os.chdir(MARL_DIR)
-        
         try:
-            from marl_config import WINDOW_SIZE
-            from environment import MARLStockEnv
-            from data_processor import DataProcessor
-            from utils import convert_joint_action_to_signal
+            WINDOW_SIZE = _marl_module("marl_config").WINDOW_SIZE
+            MARLStockEnv = _marl_module("environment").MARLStockEnv
+            DataProcessor = _marl_module("data_processor").DataProcessor
+            convert_joint_action_to_signal = _marl_module("utils").convert_joint_action_to_signal
             
             start_dt = datetime.strptime(start_date_str, "%Y-%m-%d")
             data_start = (start_dt - timedelta(days=180)).strftime("%Y-%m-%d")
@@ -489,41 +878,50 @@ class MarlWrapper:
             target_date = start_dt
             
             dummy_env = MARLStockEnv(norm_features, prices_df, a0, a1, a2)
+            obs_dims = [dummy_env.observation_dim_0, dummy_env.observation_dim_1, dummy_env.observation_dim_2]
 
+            # 1) 대상 날짜를 모으고, 에이전트별 관측값을 (날짜 수, obs_dim) float32 배열 한 덩어리에 채움
+            #    (날짜·에이전트마다 텐서를 만들지 않고 연속 버퍼에 행 단위로 복사)
+            targets = []
             while target_date <= end_dt:
-                date_str = target_date.strftime("%Y-%m-%d")
-                
-                if target_date not in norm_features.index:
-                    target_date += timedelta(days=1)
-                    continue
-                
-                idx = norm_features.index.get_loc(target_date)
-                prev_idx = idx - 1
-                if prev_idx < WINDOW_SIZE:
-                    target_date += timedelta(days=1)
-                    continue
-                
+                if target_date in norm_features.index:
+                    prev_idx = norm_features.index.get_loc(target_date) - 1
+                    if prev_idx >= WINDOW_SIZE:
+                        targets.append((target_date, prev_idx))
+                target_date += timedelta(days=1)
+
+            if not targets:
+                return results
+
+            obs_batches = [np.empty((len(targets), dim), dtype=np.float32) for dim in obs_dims]
+            for k, (_, prev_idx) in enumerate(targets):
                 dummy_env.current_step = prev_idx - WINDOW_SIZE + 1
                 obs_dict, _ = dummy_env._get_obs_and_state()
-                
+                for i, batch in enumerate(obs_batches):
+                    batch[k] = obs_dict[f'agent_{i}']
+
+            # 2) 에이전트마다 전체 기간을 배치 한 번으로 추론 → 온도 softmax 확률
+            with torch.inference_mode():
+                q_batches = self._q_values_batch(obs_batches)
+                probs_batches = [
+                    F.softmax(q / self.TEMP_HISTORY, dim=-1).cpu().numpy() for q in q_batches
+                ]
+
+            # 3) 날짜 순서대로 샘플링 + 수익률 누적 (에이전트 0 → 1 → 2 샘플링 순서는 기존과 동일)
+            for k, (target_date, _) in enumerate(targets):
+                date_str = target_date.strftime("%Y-%m-%d")
+
                 joint_action = []
-                with torch.no_grad():
-                    for i, agent in enumerate(self.learner.agents):
-                        agent_id = f'agent_{i}'
-                        obs = torch.FloatTensor(obs_dict[agent_id]).unsqueeze(0).to(self.learner.dvc)
-                        q_values = agent.q_net(obs)
-                        
-                        probs = F.softmax(q_values / self.TEMP_HISTORY, dim=-1).cpu().numpy()[0]
-                        action = np.random.choice(len(probs), p=probs)
-                        joint_action.append(action)
+                for probs_batch in probs_batches:
+                    probs = probs_batch[k]
+                    action = np.random.choice(len(probs), p=probs)
+                    joint_action.append(action)
 
                 final_signal_str = convert_joint_action_to_signal(
-                    joint_action, {0: "Long", 1: "Hold", 2: "Short"}
+                    joint_action, MARL_ACTION_MAP
                 )
                 
-                signal_int = 2
-                if final_signal_str in ["매수", "적극 매수"]: signal_int = 0
-                elif final_signal_str in ["매도", "적극 매도"]: signal_int = 1
+                signal_int = MARL_SIGNAL_TO_ACTION.get(final_signal_str, 2)
                 
                 if signal_int == 2:
                     curr_p = prices_df.loc[target_date]
@@ -535,7 +933,7 @@ class MarlWrapper:
                 prev_price = prices_df.iloc[prices_df.index.get_loc(target_date)-1]
                 daily_ret = (curr_price - prev_price) / prev_price
                 
-                pos = {0: 1.0, 1: -1.0, 2: 0.0}[signal_int]
+                pos = POSITION_BY_ACTION[signal_int]
                 strat_ret = pos * daily_ret
                 cum_ret = (1 + cum_ret) * (1 + strat_ret) - 1
                 
@@ -546,15 +944,11 @@ class MarlWrapper:
                     "strategy_return": float(cum_ret)
                 })
                 
-                target_date += timedelta(days=1)
-                
             return results
 
         except Exception as e:
             print(f"[MARL] History Error: {e}")
             return []
-        finally:
-            os.chdir(original_cwd)
 
     def predict_today(self):
         # 1. 이전에 예측한 데이터가 있는지 확인
@@ -564,12 +958,12 @@ class MarlWrapper:
             return self.cached_prediction
 
         self.load_model()
-        original_cwd = os.getcwd()
-        os.chdir(MARL_DIR)
         try:
-            from marl_config import WINDOW_SIZE
-            from environment import MARLStockEnv
-            from utils import convert_joint_action_to_signal, get_top_features_marl
+            WINDOW_SIZE = _marl_module("marl_config").WINDOW_SIZE
+            MARLStockEnv = _marl_module("environment").MARLStockEnv
+            marl_utils = _marl_module("utils")
+            convert_joint_action_to_signal = marl_utils.convert_joint_action_to_signal
+            get_top_features_marl = marl_utils.get_top_features_marl
             
             features_df, prices_df, _, a0, a1, a2 = self.processor.process()
             norm_features, _ = self.processor.normalize_data(features_df, features_df)
@@ -603,25 +997,21 @@ class MarlWrapper:
                 agent_analyses.append((action, q_vals, importance))
 
             final_signal_str = convert_joint_action_to_signal(
-                joint_action, {0: "Long", 1: "Hold", 2: "Short"}
+                joint_action, MARL_ACTION_MAP
             )
             
-            signal_int = 2
-            if final_signal_str in ["매수", "적극 매수"]: signal_int = 0
-            elif final_signal_str in ["매도", "적극 매도"]: signal_int = 1
+            signal_int = MARL_SIGNAL_TO_ACTION.get(final_signal_str, 2)
 
             top_features = get_top_features_marl(agent_analyses)
 
             # Top-3 지표에 현재 값(value) 주입
             try:
-                last_row = features_df.iloc[-1]
+                last_values = dict(zip(features_df.columns, features_df.iloc[-1:].to_numpy(np.float64)[0].tolist()))
                 for feat in top_features:
                     if not isinstance(feat, dict): continue
                     name = (feat.get("name") or feat.get("base") or feat.get("indicator"))
-                    if name and name in last_row.index:
-                        try:
-                            feat["value"] = float(last_row[name])
-                        except: pass
+                    if name and name in last_values:
+                        feat["value"] = last_values[name]
             except: pass
             
             result = {
@@ -640,11 +1030,8 @@ class MarlWrapper:
             
         except Exception as e:
             print(f"[MARL] Predict Error: {e}")
-            import traceback
             traceback.print_exc()
             return None
-        finally:
-            os.chdir(original_cwd)
 
 
 # === Global Instances ===
@@ -652,16 +1039,113 @@ a2c_wrapper = A2CWrapper()
 marl_wrapper = MarlWrapper()
 
 
+def _warmup_numba_kernels():
+    """
+    지표 계산 Numba 커널을 미리 컴파일 (모델 로드와 무관하게 실행 가능)
+    (_build_state_numba는 시그니처를 명시해서 import 시점에 이미 컴파일됨)
+    """
+    _a2c_module("indicators_numba").warmup()
+
+
+def _warmup_a2c():
+    start = time.perf_counter()
+    a2c_wrapper.load_model()
+    if a2c_wrapper.model_loaded:
+        state_dim = a2c_wrapper.agent.ac_net.feature_layer[0].in_features
+        with torch.inference_mode():
+            a2c_wrapper._policy_logits(np.zeros(state_dim, dtype=np.float32))
+    print(f"[Warmup] A2C ready={a2c_wrapper.model_loaded} ({time.perf_counter() - start:.1f}s)")
+
+
+def _warmup_marl():
+    start = time.perf_counter()
+    marl_wrapper.load_model()
+    if marl_wrapper.model_loaded:
+        # 히스토리 경로(trace된 net + autocast)를 몇 번 실행해 CUDA 컨텍스트/커널 선택 비용을 시작 시점에 지불
+        dvc = torch.device(marl_wrapper.learner.dvc)
+        dummies = [
+            torch.zeros(1, agent.obs_dim, device=dvc) for agent in marl_wrapper.learner.agents
+        ]
+        with torch.inference_mode(), marl_wrapper._autocast():
+            for _ in range(3):
+                for net, x in zip(marl_wrapper.infer_nets, dummies):
+                    net(x)
+        if dvc.type == "cuda":
+            torch.cuda.synchronize(dvc)
+    print(f"[Warmup] MARL ready={marl_wrapper.model_loaded} ({time.perf_counter() - start:.1f}s)")
+
+
+def warmup_models():
+    """
+    서버 시작 시 모델 로드 + JIT/trace 경로를 미리 한 번 실행해서
+    첫 사용자 요청이 콜드 스타트 비용(모델 로드, Numba 컴파일, SHAP 배경 데이터 다운로드)을 떠안지 않게 함.
+    A2C / MARL 로드와 Numba 컴파일은 서로 독립적이라 병렬로 실행 (대부분 I/O·import 대기)
+    → 시작 시간이 세 작업의 합이 아니라 가장 느린 작업 수준으로 줄어듦.
+    """
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="warmup") as ex:
+        futures = [
+            ex.submit(_warmup_a2c),
+            ex.submit(_warmup_marl),
+            ex.submit(_warmup_numba_kernels),
+        ]
+        for future in futures:
+            future.result()
+
+    print(f"[Warmup] Total {time.perf_counter() - start:.1f}s")
+
+
 # === Service Layer (통합된 예측 및 GPT 설명 서비스) ===
-ACTION_ID_TO_EN = {0: "BUY", 1: "SELL", 2: "HOLD"}
-ACTION_ID_TO_KO = {0: "매수", 1: "매도", 2: "관망"}
+ACTION_ID_TO_EN = MappingProxyType({0: "BUY", 1: "SELL", 2: "HOLD"})
+ACTION_ID_TO_KO = MappingProxyType({0: "매수", 1: "매도", 2: "관망"})
 
 class AIService:
+    # 예측 결과(GPT 설명 포함) 캐시: 키에 날짜가 들어가 있어 하루가 지나면 자동으로 새로 예측하고,
+    # 같은 날에도 TTL이 지나면 다시 생성. 종목/성향 조합이 많아져도 메모리가 무한정 늘지 않도록 LRU로 제한
+    PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+    PREDICTION_CACHE_MAXSIZE = int(os.getenv("PREDICTION_CACHE_MAXSIZE", "4096"))
+
     def __init__(self):
         self.a2c = a2c_wrapper
         self.marl = marl_wrapper
-        # 캐싱을 위한 딕셔너리
-        self.prediction_cache = {}
+        # 캐싱을 위한 LRU: (날짜, 종목, 모드, 성향) -> (만료 시각, 결과)
+        self.prediction_cache: "OrderedDict[Tuple[str, str, str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # 진행 중인 예측: 같은 키로 동시에 들어온 요청은 새로 계산하지 않고 먼저 시작한 요청의 결과를 기다림
+        self._inflight: Dict[Tuple[str, str, str, str], Future] = {}
+        self.coalesced = 0
+
+    def _cache_get(self, cache_key) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            cached = self.prediction_cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                self.prediction_cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                return cached[1]
+            self.cache_misses += 1
+            return None
+
+    def _cache_put(self, cache_key, result: Dict[str, Any]):
+        with self._cache_lock:
+            self.prediction_cache[cache_key] = (time.monotonic() + self.PREDICTION_CACHE_TTL, result)
+            self.prediction_cache.move_to_end(cache_key)
+            while len(self.prediction_cache) > self.PREDICTION_CACHE_MAXSIZE:
+                self.prediction_cache.popitem(last=False)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        with self._cache_lock:
+            return {
+                "size": len(self.prediction_cache),
+                "maxsize": self.PREDICTION_CACHE_MAXSIZE,
+                "ttl_seconds": self.PREDICTION_CACHE_TTL,
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "coalesced": self.coalesced,
+                "inflight": len(self._inflight),
+            }
 
     def predict_today(self, symbol: Optional[str] = None, mode: str = "a2c", investment_style: str = "aggressive") -> Dict[str, Any]:
         if mode not in ("a2c", "marl"):
@@ -674,10 +1158,33 @@ class AIService:
         today_str = datetime.now().strftime("%Y-%m-%d")
         cache_key = (today_str, symbol, mode, investment_style)
 
-        if cache_key in self.prediction_cache:
+        cached = self._cache_get(cache_key)
+        if cached is not None:
             print(f"[AIService] Using cached result for {cache_key}")
-            return self.prediction_cache[cache_key]
+            return cached
+
+        # 1-1. 같은 키의 예측이 이미 진행 중이면 그 결과를 공유 (모델 추론 + GPT 호출을 한 번만 수행)
+        with self._cache_lock:
+            future = self._inflight.get(cache_key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[cache_key] = future
+            else:
+                self.coalesced += 1
+        if not is_owner:
+            return future.result()
+
+        result = None
+        try:
+            result = self._predict_uncached(symbol, mode, investment_style, cache_key)
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(cache_key, None)
+            future.set_result(result)
+        return result
 
+    def _predict_uncached(self, symbol: str, mode: str, investment_style: str, cache_key) -> Optional[Dict[str, Any]]:
         try:
             # 2. 모델 예측 실행
             if mode == "a2c":
@@ -739,7 +1246,7 @@ class AIService:
             }
 
             # 캐시에 저장
-            self.prediction_cache[cache_key] = result
+            self._cache_put(cache_key, result)
             return result
 
         except Exception as e:
@@ -1,13 +1,64 @@
-from sqlalchemy.orm import Session
+import csv
+import io
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, selectinload
 from . import models, schemas
 from datetime import datetime
 
+# bulk insert 시 한 번의 executemany로 보내는 최대 행 수
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+def _insert_ignore(db: Session, table, index_elements: list[str]):
+    """
+    유니크 키(index_elements) 충돌 시 해당 행을 건너뛰는 INSERT 문을 만든다.
+    - PostgreSQL/SQLite: INSERT ... ON CONFLICT DO NOTHING
+    - 그 외 DB: 일반 INSERT (중복 시 DB 에러)
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    return insert(table)
+
 def get_user(db: Session, user_id: int):
     return db.query(models.User).filter(models.User.id == user_id).first()
 
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
+# 로그인 시 이메일로 조회한 (user_id, hashed_password)를 잠시 캐시
+# (같은 유저의 반복 로그인은 DB를 거치지 않음, id/비밀번호는 수정하는 API가 없어 무효화 불필요)
+LOGIN_CACHE_TTL = 60.0
+LOGIN_CACHE_MAXSIZE = 10_000
+_login_cache: "OrderedDict[str, tuple[float, int, str]]" = OrderedDict()
+_login_cache_lock = threading.Lock()
+
+def get_login_credentials(db: Session, email: str) -> tuple[int, str] | None:
+    """로그인용 (user_id, hashed_password) 조회. 없는 이메일이면 None (None은 캐시하지 않음)"""
+    now = time.monotonic()
+    with _login_cache_lock:
+        cached = _login_cache.get(email)
+        if cached is not None and cached[0] > now:
+            _login_cache.move_to_end(email)
+            return cached[1], cached[2]
+
+    user = get_user_by_email(db, email)
+    if user is None:
+        return None
+
+    with _login_cache_lock:
+        _login_cache[email] = (now + LOGIN_CACHE_TTL, user.id, user.hashed_password)
+        _login_cache.move_to_end(email)
+        while len(_login_cache) > LOGIN_CACHE_MAXSIZE:
+            _login_cache.popitem(last=False)
+    return user.id, user.hashed_password
+
 def create_user(db: Session, user: schemas.UserCreate):
     db_user = models.User(
         email=user.email, 
@@ -16,7 +67,6 @@ def create_user(db: Session, user: schemas.UserCreate):
     )
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 def update_user_investment_style(db: Session, user_id: int, investment_style: str):
@@ -25,7 +75,6 @@ def update_user_investment_style(db: Session, user_id: int, investment_style: st
         db_user.investment_style = investment_style
         db_user.onboarding_completed = True  # 투자 성향 설정 시 온보딩 완료로 표시
         db.commit()
-        db.refresh(db_user)
     return db_user
 
 # 온보딩 완료 처리 (초기투자금 + 보유종목 + 투자성향)
@@ -93,26 +142,48 @@ def complete_onboarding(db: Session, user_id: int, onboarding_data: schemas.Onbo
     portfolio.updated_at = datetime.utcnow()
     
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 
 # 포트폴리오 가져오기 (없으면 자동 생성)
 def get_portfolio_by_user(db: Session, user_id: int):
-    portfolio = db.query(models.Portfolio).filter(models.Portfolio.user_id == user_id).first()
+    # 보유 종목은 SELECT ... WHERE portfolio_id IN (...) 한 번으로 함께 로드 (종목별 lazy load 방지)
+    portfolio = (
+        db.query(models.Portfolio)
+        .options(selectinload(models.Portfolio.holdings))
+        .filter(models.Portfolio.user_id == user_id)
+        .first()
+    )
     if not portfolio:
         # 포트폴리오가 없으면 기본값으로 생성해버림 (편의성)
-        portfolio = models.Portfolio(
-            user_id=user_id,
-            portfolio_id=f"user_{user_id}_default",
-            initial_capital=10000000.0,
-            current_capital=10000000.0
+        # 같은 유저의 첫 요청이 동시에 들어와도 user_id 유니크 충돌 없이 한 행만 생성
+        now = datetime.utcnow()
+        db.execute(
+            _insert_ignore(db, models.Portfolio.__table__, ["user_id"]).values(
+                user_id=user_id,
+                portfolio_id=f"user_{user_id}_default",
+                initial_capital=10000000.0,
+                current_capital=10000000.0,
+                created_at=now,
+                updated_at=now,
+            )
         )
-        db.add(portfolio)
         db.commit()
-        db.refresh(portfolio)
+        portfolio = (
+            db.query(models.Portfolio)
+            .options(selectinload(models.Portfolio.holdings))
+            .filter(models.Portfolio.user_id == user_id)
+            .first()
+        )
     return portfolio
 
+def _record_trade(db: Session, **values):
+    """
+    투자 기록(InvestmentRecord) 한 건을 Core INSERT로 추가 (ORM 객체 생성/flush 생략).
+    커밋은 호출한 쪽의 트랜잭션과 함께 처리된다.
+    """
+    db.execute(insert(models.InvestmentRecord.__table__).values(**values))
+
 # 보유 주식 추가하기 (매수 로직)
 def add_holding(db: Session, user_id: int, holding_data: schemas.HoldingCreate):
     portfolio = get_portfolio_by_user(db, user_id)
@@ -146,7 +217,8 @@ def add_holding(db: Session, user_id: int, holding_data: schemas.HoldingCreate):
     portfolio.updated_at = datetime.utcnow()
     
     #투자 기록(History) 저장하기 
-    history_record = models.InvestmentRecord(
+    _record_trade(
+        db,
         portfolio_id=portfolio.portfolio_id, # 문자열 ID 사용
         model_type="manual_trade",           # 사용자가 직접 매수함
         signal="BUY",
@@ -154,7 +226,6 @@ def add_holding(db: Session, user_id: int, holding_data: schemas.HoldingCreate):
         shares=holding_data.quantity,
         portfolio_value=portfolio.total_asset if hasattr(portfolio, 'total_asset') else 0 # 현재 가치는 계산 필요하지만 일단 0 또는 임시값
     )
-    db.add(history_record) # 기록 저장
 
     db.commit()
     return portfolio
@@ -186,7 +257,8 @@ def sell_holding(db: Session, user_id: int, sell_data: schemas.HoldingSell):
     portfolio.updated_at = datetime.utcnow()
 
     # 5. 매도 기록(History) 남기기
-    sell_record = models.InvestmentRecord(
+    _record_trade(
+        db,
         portfolio_id=portfolio.portfolio_id,
         model_type="manual_trade",
         signal="SELL",
@@ -194,7 +266,6 @@ def sell_holding(db: Session, user_id: int, sell_data: schemas.HoldingSell):
         shares=sell_data.quantity,
         pnl=profit # 이번 거래로 번 돈 (손익)
     )
-    db.add(sell_record)
 
     # 6. 수량 차감 로직 (핵심!)
     if holding.quantity == sell_data.quantity:
@@ -213,41 +284,75 @@ def sell_holding(db: Session, user_id: int, sell_data: schemas.HoldingSell):
 # 주가 데이터 저장
 # ---------------------------------------------------------------------
 def create_stock_price(db: Session, stock_price: schemas.StockPriceCreate):
-    db_stock_price = models.StockPrice(**stock_price.dict())
+    db_stock_price = models.StockPrice(**stock_price.model_dump())
     db.add(db_stock_price)
     db.commit()
-    db.refresh(db_stock_price)
     return db_stock_price
 
-def bulk_create_stock_prices(db: Session, stock_prices: list[schemas.StockPriceCreate]):
+def _copy_stock_prices(db: Session, stock_prices: list[dict]) -> int:
+    """
+    PostgreSQL 전용: COPY로 임시 테이블에 한 번에 적재한 뒤
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING 으로 옮긴다.
+    (COPY 자체는 중복을 건너뛸 수 없으므로 임시 테이블을 거침)
+    """
+    created_at = datetime.utcnow()
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for sp in stock_prices:
+        # None은 빈 칸으로 기록 → COPY CSV에서 NULL로 해석됨
+        writer.writerow((
+            sp["symbol"], sp["date"], sp.get("open"), sp.get("high"),
+            sp.get("low"), sp.get("close"), sp.get("volume"), created_at,
+        ))
+    buf.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(
+            "CREATE TEMP TABLE tmp_stock_prices ON COMMIT DROP AS "
+            "SELECT symbol, date, open, high, low, close, volume, created_at "
+            "FROM stock_prices WITH NO DATA"
+        )
+        cursor.copy_expert(
+            "COPY tmp_stock_prices (symbol, date, open, high, low, close, volume, created_at) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+        cursor.execute(
+            "INSERT INTO stock_prices (symbol, date, open, high, low, close, volume, created_at) "
+            "SELECT symbol, date, open, high, low, close, volume, created_at FROM tmp_stock_prices "
+            "ON CONFLICT (symbol, date) DO NOTHING"
+        )
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def bulk_create_stock_prices(db: Session, stock_prices: list[dict]):
+    """
+    주가 행(dict: symbol, date, open, high, low, close, volume) 일괄 저장.
+    이미 있는 (symbol, date)는 유니크 인덱스 충돌로 DB가 알아서 건너뜀.
+    반환값: 새로 저장된 행 수
+    """
     if not stock_prices:
         return 0
 
-    # 1. 입력된 데이터에서 (symbol, date) 목록 추출
-    symbols = {sp.symbol for sp in stock_prices}
-    dates = {sp.date for sp in stock_prices}
-    
-    # 2. DB에서 이미 존재하는 (symbol, date) 조회
-    existing_records = db.query(models.StockPrice).filter(
-        models.StockPrice.symbol.in_(symbols),
-        models.StockPrice.date.in_(dates)
-    ).all()
-    
-    existing_keys = {(r.symbol, r.date) for r in existing_records}
-    
-    # 3. 중복되지 않는 데이터만 필터링
-    new_records = []
-    for sp in stock_prices:
-        if (sp.symbol, sp.date) not in existing_keys:
-            new_records.append(models.StockPrice(**sp.dict()))
-            # 중복 방지를 위해 추가한 키도 existing_keys에 등록 (입력 데이터 내 중복 방지)
-            existing_keys.add((sp.symbol, sp.date))
-            
-    if new_records:
-        db.add_all(new_records)
+    # PostgreSQL은 COPY가 행 단위 INSERT보다 훨씬 빠름
+    if db.get_bind().dialect.name == "postgresql":
+        count = _copy_stock_prices(db, stock_prices)
         db.commit()
-        
-    return len(new_records)
+        return count
+
+    # 그 외 DB: ORM 객체 없이 Core INSERT를 chunk 단위 executemany로 실행
+    stmt = _insert_ignore(db, models.StockPrice.__table__, ["symbol", "date"])
+    count = 0
+    for start in range(0, len(stock_prices), BULK_INSERT_CHUNK_SIZE):
+        chunk = stock_prices[start:start + BULK_INSERT_CHUNK_SIZE]
+        result = db.execute(stmt, chunk)
+        # 드라이버가 rowcount를 주지 않으면(-1) 시도한 건수로 대체
+        count += result.rowcount if result.rowcount >= 0 else len(chunk)
+    db.commit()
+    return count
 
 def get_stock_prices(db: Session, symbol: str, days: int = 30):
     return db.query(models.StockPrice)\
@@ -263,13 +368,58 @@ def get_latest_stock_date(db: Session, symbol: str):
         .first()
     return result[0] if result else None
 
-def get_investment_history(db: Session, user_id: int):
+def iter_investment_history(
+    db: Session,
+    user_id: int,
+    model_type: str | None = None,
+    limit: int | None = None,
+):
+    """
+    거래 내역을 최신순으로 yield_per(500) 단위 묶음(list[dict])으로 흘려보냄.
+    전체 결과를 메모리에 올리지 않고 커서에서 읽는 대로 넘겨줌 (스트리밍 응답용).
+    """
     # 1. 유저의 포트폴리오 정보 가져오기 (portfolio_id 문자열이 필요함)
     portfolio = get_portfolio_by_user(db, user_id)
     if not portfolio:
-        return []
+        return
     
     # 2. 해당 포트폴리오의 거래 내역을 최신순으로 조회
-    return db.query(models.InvestmentRecord).filter(
-        models.InvestmentRecord.portfolio_id == portfolio.portfolio_id
-    ).order_by(models.InvestmentRecord.timestamp.desc()).all()
\ No newline at end of file
+    #    응답에 필요한 컬럼만 SELECT하고 ORM 객체 대신 dict로 바로 변환 (행 수가 많아도 가볍게)
+    record = models.InvestmentRecord
+    stmt = (
+        select(
+            record.id,
+            record.timestamp,
+            record.portfolio_id,
+            record.model_type,
+            record.signal,
+            record.entry_price,
+            record.shares,
+            record.portfolio_value,
+            record.pnl,
+            record.gpt_explanation,
+        )
+        .where(record.portfolio_id == portfolio.portfolio_id)
+        .order_by(record.timestamp.desc())
+        .execution_options(yield_per=500)
+    )
+    # (portfolio_id, model_type, timestamp DESC) 인덱스 범위 스캔으로 필요한 행만 읽음
+    if model_type is not None:
+        stmt = stmt.where(record.model_type == model_type)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    for partition in db.execute(stmt).mappings().partitions():
+        yield [dict(row) for row in partition]
+
+def get_investment_history(
+    db: Session,
+    user_id: int,
+    model_type: str | None = None,
+    limit: int | None = None,
+):
+    return [
+        schemas.InvestmentRecordResponse.model_construct(**row)
+        for batch in iter_investment_history(db, user_id, model_type=model_type, limit=limit)
+        for row in batch
+    ]
\ No newline at end of file
@@ -1,7 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,16 +14,52 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
 if SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
     SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if "sqlite" in SQLALCHEMY_DATABASE_URL:
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
+        # WAL 모드: 쓰기 중에도 다른 요청의 읽기가 막히지 않도록 함
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+else:
+    # 동시 요청마다 get_db 세션이 커넥션을 잡으므로 기본 풀(5 + 10)보다 넉넉하게 설정
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+        pool_pre_ping=True,   # 끊어진 커넥션을 사용 전에 감지
+        pool_recycle=1800,    # 30분 지난 커넥션은 재연결
+        connect_args={"options": "-c statement_timeout=5000"}
+        if SQLALCHEMY_DATABASE_URL.startswith("postgresql")
+        else {},
+    )
+# expire_on_commit=False: 커밋 후에도 객체 값을 그대로 사용 (응답 직렬화 시 재조회 SELECT 방지)
+# 모든 컬럼 기본값이 파이썬 측(default=)이라 INSERT 후 객체에 이미 채워져 있음
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
-def get_db():
+@contextmanager
+def session_scope():
+    """
+    풀에서 커넥션을 빌려 쓰는 세션 컨텍스트.
+    예외가 나면 롤백하고, 끝나면 close()로 커넥션을 풀에 반납한다.
+    (라우터 밖의 백그라운드 작업/스크립트에서도 with session_scope() as db: 로 사용)
+    """
     db = SessionLocal()
     try:
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+
+def get_db():
+    with session_scope() as db:
+        yield db
@@ -1,5 +1,9 @@
+import os
+import time
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from . import models, schemas, crud
 from .database import engine, get_db
@@ -7,7 +11,8 @@ from .routers import portfolio, stocks, ai, users
 
 models.Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+# 응답 직렬화는 orjson으로 (datetime / numpy 값도 그대로 직렬화)
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.include_router(portfolio.router)
 app.include_router(stocks.router)
@@ -26,6 +31,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def warmup():
+    """
+    모델 로드/JIT 컴파일/시세 API 커넥션을 서버 시작 시 미리 준비.
+    (EAGER_LOAD_MODELS=0 이면 건너뛰고 첫 요청 시 로드)
+    """
+    if os.getenv("EAGER_LOAD_MODELS", "1") != "1":
+        return
+
+    try:
+        from .ai_wrapper import warmup_models
+        from .stock_fetcher import fetch_current_price
+
+        warmup_models()
+        fetch_current_price("005930.KS")
+    except Exception as e:
+        # 워밍업 실패로 서버가 안 뜨면 안 되므로 로그만 남김 (첫 요청 시 다시 로드 시도)
+        print(f"[Warmup] Failed: {e}")
+
+@app.on_event("shutdown")
+def close_http_session():
+    from .stock_fetcher import close_session
+
+    close_session()
+
+# 헬스체크의 DB 확인 결과를 재사용하는 시간(초). 프로브가 자주 호출돼도 DB에는 이 간격으로만 질의
+HEALTH_CHECK_INTERVAL = 5.0
+
+@app.get("/health")
+def health():
+    """서버/DB 상태 확인 (DB 확인 결과는 HEALTH_CHECK_INTERVAL초 동안 캐시)"""
+    now = time.monotonic()
+    cached = getattr(app.state, "db_health", None)
+    if cached is not None and now - cached[0] < HEALTH_CHECK_INTERVAL:
+        db_ok = cached[1]
+    else:
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            db_ok = True
+        except Exception as e:
+            print(f"[Health] DB check failed: {e}")
+            db_ok = False
+        app.state.db_health = (now, db_ok)
+
+    return {"status": "ok" if db_ok else "degraded", "db_ok": db_ok}
+
 @app.get("/")
 def read_root():
     return {"message": "Database is set up!"}
\ No newline at end of file
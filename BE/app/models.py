@@ -90,16 +90,26 @@ class InvestmentRecord(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+# 포트폴리오별 거래 내역(최신순) 조회용. PostgreSQL에서는 목록에 쓰는 컬럼을 INCLUDE해서
+# 인덱스만으로 읽을 수 있게 함 (SQLite 등에서는 무시됨)
 Index(
     "idx_investment_record_portfolio_timestamp",
     InvestmentRecord.portfolio_id,
     InvestmentRecord.timestamp,
+    postgresql_include=["signal", "entry_price", "shares", "portfolio_value", "pnl"],
 )
 Index(
     "idx_investment_record_model_timestamp",
     InvestmentRecord.model_type,
     InvestmentRecord.timestamp,
 )
+# 포트폴리오 + 모델별 거래 내역(최신순, LIMIT) 조회용
+Index(
+    "idx_investment_record_portfolio_model_timestamp",
+    InvestmentRecord.portfolio_id,
+    InvestmentRecord.model_type,
+    InvestmentRecord.timestamp.desc(),
+)
 
 
 # ---------------------------------------------------------------------
@@ -122,7 +132,7 @@ class Portfolio(Base):
 
     # [추가] 관계 설정
     owner = relationship("User", back_populates="portfolio")
-    holdings = relationship("Holding", back_populates="portfolio")
+    holdings = relationship("Holding", back_populates="portfolio", lazy="selectin")
 
 # ---------------------------------------------------------------------
 # [신규] 보유 주식 테이블 (Holding) - 새로 추가
@@ -139,6 +149,17 @@ class Holding(Base):
 
     portfolio = relationship("Portfolio", back_populates="holdings")
 
+
+# 포트폴리오별 보유 종목 조회용 커버링 인덱스
+# (portfolio_id로 필터하고 종목/수량/평단가는 테이블을 읽지 않고 인덱스에서 바로 가져옴)
+Index(
+    "ix_holdings_portfolio_covering",
+    Holding.portfolio_id,
+    Holding.symbol,
+    Holding.quantity,
+    Holding.avg_price,
+)
+
 # ---------------------------------------------------------------------
 # 4) 주가 히스토리 테이블 (StockPrice)
 # ---------------------------------------------------------------------
@@ -159,4 +180,5 @@ class StockPrice(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
-Index("idx_stock_price_symbol_date", StockPrice.symbol, StockPrice.date)
+# 같은 종목/날짜 시세는 한 번만 저장 (bulk insert 시 ON CONFLICT DO NOTHING 기준)
+Index("idx_stock_price_symbol_date", StockPrice.symbol, StockPrice.date, unique=True)
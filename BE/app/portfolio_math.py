@@ -0,0 +1,31 @@
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def compute_holdings(quantities, avg_prices, current_prices):
+    """
+    보유 종목별 평가금액/수익률과 주식 평가액 합계를 한 번에 계산.
+
+    Args:
+        quantities, avg_prices, current_prices: 같은 길이의 float64 배열
+
+    Returns:
+        (values, profit_rates, total)
+        - values: 종목별 평가금액 (현재가 * 수량)
+        - profit_rates: 종목별 수익률 (%), 평단가가 0 이하이면 0
+        - total: 평가금액 합계
+    """
+    n = quantities.shape[0]
+    values = np.empty(n)
+    profit_rates = np.empty(n)
+    total = 0.0
+    for i in range(n):
+        value = quantities[i] * current_prices[i]
+        values[i] = value
+        if avg_prices[i] > 0:
+            profit_rates[i] = ((current_prices[i] - avg_prices[i]) / avg_prices[i]) * 100.0
+        else:
+            profit_rates[i] = 0.0
+        total += value
+    return values, profit_rates, total
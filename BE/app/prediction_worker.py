@@ -0,0 +1,34 @@
+"""
+예측 전용 워커 프로세스에서 실행되는 함수들.
+
+PREDICTION_PROCESSES > 0 이면 routers/ai.py가 ProcessPoolExecutor(initializer=init_worker)를 만들고
+각 워커 프로세스가 모델을 한 번만 로드해 메모리에 들고 있음 → torch 추론이 GIL을 두고 경쟁하지 않음.
+ProcessPoolExecutor가 pickle로 넘길 수 있도록 모두 모듈 최상위 함수로 둠.
+"""
+
+import os
+from typing import Any, Dict
+
+
+def init_worker():
+    """워커 프로세스 시작 시 1회: 모델 로드 + JIT/trace 워밍업"""
+    # 워커 여러 개가 각각 intra-op 스레드를 늘리면 코어를 초과 점유하므로 워커당 1개 유지
+    os.environ.setdefault("TORCH_NUM_THREADS", "1")
+
+    from .ai_wrapper import warmup_models
+
+    try:
+        warmup_models()
+    except Exception as e:
+        # 로드 실패 시에도 워커는 살려 두고 첫 예측 요청에서 다시 로드 시도
+        print(f"[PredictionWorker {os.getpid()}] Warmup failed: {e}")
+
+
+def predict(symbol: str, mode: str, investment_style: str) -> Dict[str, Any]:
+    from .ai_wrapper import ai_service
+
+    return ai_service.predict_today(
+        symbol=symbol,
+        mode=mode,
+        investment_style=investment_style,
+    )
@@ -1,9 +1,16 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
 from fastapi import APIRouter, HTTPException, Query, Body
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Literal, Dict, Any
 from pydantic import BaseModel
 
-# 상대 경로 기준: app/routers/ai.py → app/ai_wrapper.py
-from ..ai_wrapper import a2c_wrapper, marl_wrapper, ai_service
+from ..stock_fetcher import normalize_symbol
+from .. import prediction_worker
 
 
 router = APIRouter(
@@ -12,6 +19,74 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# 예측(yfinance 다운로드 + 모델 추론 + GPT 호출)은 오래 걸리는 블로킹 작업이라
+# 전용 스레드 풀에서 실행 → 이벤트 루프와 다른 API(DB 조회 등)의 기본 스레드 풀을 막지 않음
+PREDICTION_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PREDICTION_POOL_SIZE", "8")),
+    thread_name_prefix="prediction",
+)
+
+# PREDICTION_PROCESSES > 0 이면 예측을 모델을 미리 로드한 워커 프로세스들에서 실행 (GIL 경쟁 없음)
+# 워커마다 모델/데이터 캐시를 따로 들고 있으므로 메모리는 워커 수만큼 더 사용함
+# torch 스레드가 떠 있는 상태에서 fork하면 교착될 수 있어 spawn으로 생성
+PREDICTION_PROCESSES = int(os.getenv("PREDICTION_PROCESSES", "0"))
+PREDICTION_PROCESS_POOL = (
+    ProcessPoolExecutor(
+        max_workers=PREDICTION_PROCESSES,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=prediction_worker.init_worker,
+    )
+    if PREDICTION_PROCESSES > 0
+    else None
+)
+
+
+def _ai():
+    """
+    app/ai_wrapper 모듈을 처음 사용할 때 import (torch/numba/pandas 로드에 수 초 소요).
+    라우터 import만으로 모델 스택을 올리지 않으므로 EAGER_LOAD_MODELS=0 이나
+    PREDICTION_PROCESSES > 0(모델은 워커 프로세스에서만 사용)일 때 서버 시작이 빨라짐.
+    두 번째 호출부터는 sys.modules에 캐시된 모듈을 그대로 반환.
+    """
+    from .. import ai_wrapper
+
+    return ai_wrapper
+
+
+@router.on_event("startup")
+def start_prediction_workers():
+    # spawn 방식은 워커를 필요할 때 만들기 때문에, 시작 시 워커 수만큼 작업을 넣어 미리 띄워 둠
+    if PREDICTION_PROCESS_POOL is not None:
+        for _ in range(PREDICTION_PROCESSES):
+            PREDICTION_PROCESS_POOL.submit(os.getpid)
+
+
+@router.on_event("shutdown")
+def stop_prediction_workers():
+    if PREDICTION_PROCESS_POOL is not None:
+        PREDICTION_PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run_prediction(symbol: str, mode: str, investment_style: str):
+    loop = asyncio.get_running_loop()
+    if PREDICTION_PROCESS_POOL is not None:
+        return await loop.run_in_executor(
+            PREDICTION_PROCESS_POOL,
+            prediction_worker.predict,
+            symbol,
+            mode,
+            investment_style,
+        )
+    return await loop.run_in_executor(
+        PREDICTION_POOL,
+        partial(
+            _ai().ai_service.predict_today,
+            symbol=symbol,
+            mode=mode,
+            investment_style=investment_style,
+        ),
+    )
+
 
 # ---------------------------
 # 1) 히스토리/디버깅용 모델들
@@ -77,11 +152,13 @@ def get_history(
     """
     A2C / MARL 모델의 과거 시그널 & 전략 수익률 조회 (디버깅/분석용)
     """
+    # 래퍼가 이미 HistoricalSignal 형태의 dict 리스트를 만들어 주므로
+    # 응답 모델 검증/변환 없이 orjson으로 바로 직렬화 (response_model은 문서용)
     model_type = model_type.lower()
     if model_type == "a2c":
-        return a2c_wrapper.get_historical_signals(start_date)
+        return ORJSONResponse(_ai().a2c_wrapper.get_historical_signals(start_date))
     elif model_type == "marl":
-        return marl_wrapper.get_historical_signals(start_date)
+        return ORJSONResponse(_ai().marl_wrapper.get_historical_signals(start_date))
     else:
         raise HTTPException(
             status_code=400,
@@ -89,6 +166,16 @@ def get_history(
         )
 
 
+# --------------------------------
+# GET /ai/cache/stats  (디버깅용 엔드포인트)
+# --------------------------------
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    """예측 결과 캐시 상태 (크기, 적중/미스 횟수)"""
+    return _ai().ai_service.cache_stats()
+
+
 # --------------------------------
 # GET /ai/signal  (디버깅용 엔드포인트)
 # --------------------------------
@@ -105,13 +192,13 @@ def get_today_signal(
     model_type = model_type.lower()
 
     if model_type == "a2c":
-        result = a2c_wrapper.predict_today()
+        result = _ai().a2c_wrapper.predict_today()
         if result:
             return result
         raise HTTPException(status_code=500, detail="Failed to get A2C prediction")
 
     elif model_type == "marl":
-        result = marl_wrapper.predict_today()
+        result = _ai().marl_wrapper.predict_today()
         if result:
             return result
         raise HTTPException(status_code=500, detail="Failed to get MARL prediction")
@@ -128,15 +215,11 @@ def get_today_signal(
 # --------------------------------
 
 @router.post("/predict", response_model=AIPredictResponse)
-def predict(req: AIPredictRequest):
+async def predict(req: AIPredictRequest):
     """
     프론트엔드에서 실제로 사용할 메인 AI API.
     """
-    result = ai_service.predict_today(
-        symbol=req.symbol,
-        mode=req.mode,
-        investment_style=req.investment_style,
-    )
+    result = await _run_prediction(req.symbol, req.mode, req.investment_style)
 
     if not result:
         raise HTTPException(status_code=500, detail="Failed to get AI prediction")
@@ -145,39 +228,54 @@ def predict(req: AIPredictRequest):
 
 
 # --------------------------------
-# POST /ai/predict/{mode}
-#  → 프론트 호환용 래거시 엔드포인트
+# POST /ai/predict/batch
+#  → 여러 요청을 한 번에 받아 예측 스레드 풀에서 동시에 실행
+#  (/predict/{mode} 보다 먼저 등록되어야 "batch"가 mode로 잡히지 않음)
 # --------------------------------
 
-@router.post("/predict/{mode}")
-def legacy_predict(
-    mode: str,
-    payload: Dict[str, Any] = Body(...),
-):
+# 한 번에 받을 수 있는 최대 요청 수 (예측 스레드 풀을 한 클라이언트가 독점하지 않도록)
+MAX_BATCH_SIZE = 16
+
+
+@router.post("/predict/batch", response_model=List[AIPredictResponse])
+async def predict_batch(reqs: List[AIPredictRequest]):
     """
-    프론트엔드가 사용하는 옛날 형태의 예측 API를 위한 호환용 엔드포인트.
+    /ai/predict 요청 여러 개를 한 번에 처리. 응답은 요청 순서와 같은 리스트.
+    (모델 예측은 모드별로 하루 한 번 캐시되므로, 모드가 같은 요청들은 같은 예측 결과를 공유)
     """
-    mode = mode.lower()
-    if mode not in ("a2c", "marl"):
+    if not reqs or len(reqs) > MAX_BATCH_SIZE:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid mode '{mode}'. Use 'a2c' or 'marl'.",
+            detail=f"Batch size must be between 1 and {MAX_BATCH_SIZE}.",
         )
 
+    results = await asyncio.gather(
+        *(_run_prediction(req.symbol, req.mode, req.investment_style) for req in reqs)
+    )
+
+    if not all(results):
+        raise HTTPException(status_code=500, detail="Failed to get AI prediction")
+
+    return results
+
+
+# --------------------------------
+# POST /ai/predict/a2c, /ai/predict/marl
+#  → 프론트 호환용 래거시 엔드포인트
+#  (모드별 라우트를 따로 등록해서 요청마다 mode 검증/분기를 하지 않음.
+#   /predict/{mode} 보다 먼저 등록되어야 우선 매칭됨)
+# --------------------------------
+
+async def _legacy_predict(mode: str, payload: Dict[str, Any]):
+    """
+    프론트엔드가 사용하는 옛날 형태의 예측 API 본문 (mode는 호출 측에서 검증된 값)
+    """
     # 프론트에서 symbol을 "005930"만 보내는 경우 .KS 보정
-    raw_symbol = payload.get("symbol", "005930.KS")
-    if raw_symbol.isdigit():
-        symbol = f"{raw_symbol}.KS"
-    else:
-        symbol = raw_symbol
+    symbol = normalize_symbol(payload.get("symbol", "005930.KS"))
 
     investment_style = payload.get("investment_style", "aggressive")
 
-    result = ai_service.predict_today(
-        symbol=symbol,
-        mode=mode,
-        investment_style=investment_style,
-    )
+    result = await _run_prediction(symbol, mode, investment_style)
 
     if not result:
         raise HTTPException(status_code=500, detail="Failed to get AI prediction")
@@ -199,4 +297,32 @@ def legacy_predict(
         "action_ko": result.get("action_ko"),
         "investment_style": result.get("investment_style", investment_style),
         "xai_features": result.get("xai_features", []),
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/predict/a2c")
+async def legacy_predict_a2c(payload: Dict[str, Any] = Body(...)):
+    return await _legacy_predict("a2c", payload)
+
+
+@router.post("/predict/marl")
+async def legacy_predict_marl(payload: Dict[str, Any] = Body(...)):
+    return await _legacy_predict("marl", payload)
+
+
+@router.post("/predict/{mode}")
+async def legacy_predict(
+    mode: str,
+    payload: Dict[str, Any] = Body(...),
+):
+    """
+    /predict/A2C 처럼 대소문자가 다른 모드, 잘못된 모드 처리용
+    """
+    mode = mode.lower()
+    if mode not in ("a2c", "marl"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid mode '{mode}'. Use 'a2c' or 'marl'.",
+        )
+
+    return await _legacy_predict(mode, payload)
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+import numpy as np
+import orjson
 from .. import crud, schemas, database
-from ..stock_fetcher import fetch_current_price 
-from typing import List
+from ..portfolio_math import compute_holdings
+from ..stock_fetcher import fetch_current_prices
+from typing import List, Optional
 
 router = APIRouter(
     prefix="/portfolio",
@@ -13,41 +17,43 @@ router = APIRouter(
 def get_my_portfolio(user_id: int, db: Session = Depends(database.get_db)):
     """내 포트폴리오 조회 (실시간 주가 연동 완료)"""
     portfolio = crud.get_portfolio_by_user(db, user_id)
-    
-    total_stock_value = 0.0
-    response_holdings = []
-    
-    for holding in portfolio.holdings:
-        # 👇 [수정] 실제 실시간 주가 가져오기 (stock_fetcher 활용)
-        # 005930 -> 005930.KS 로 변환 (yfinance용)
-        symbol_for_fetch = holding.symbol
-        if symbol_for_fetch.isdigit():
-            symbol_for_fetch = f"{symbol_for_fetch}.KS"
-            
-        real_current_price = fetch_current_price(symbol_for_fetch)
+
+    holdings = portfolio.holdings
+    n = len(holdings)
+    quantities = np.empty(n)
+    avg_prices = np.empty(n)
+    current_prices = np.empty(n)
+
+    # 👇 [수정] 실제 실시간 주가 가져오기 (stock_fetcher 활용)
+    # 보유 종목 전체를 한 번의 시세 요청으로 조회 (005930 -> 005930.KS 변환은 fetcher에서 처리)
+    real_prices = fetch_current_prices([holding.symbol for holding in holdings])
+
+    for i, holding in enumerate(holdings):
+        real_current_price = real_prices.get(holding.symbol)
         
         # 만약 장마감/휴일 등으로 데이터를 못 가져오면 평단가로 대체 (에러 방지)
         if real_current_price is None:
             current_price = holding.avg_price
         else:
             current_price = real_current_price
-        
-        # 평가 금액 계산
-        valuation = current_price * holding.quantity
-        total_stock_value += valuation
-        
-        # 수익률 계산: (현재가 - 평단가) / 평단가 * 100
-        profit_rate = 0.0
-        if holding.avg_price > 0:
-            profit_rate = ((current_price - holding.avg_price) / holding.avg_price) * 100
-            
-        response_holdings.append({
+
+        quantities[i] = holding.quantity
+        avg_prices[i] = holding.avg_price
+        current_prices[i] = current_price
+
+    # 평가 금액 / 수익률((현재가 - 평단가) / 평단가 * 100) / 총 평가액을 한 번에 계산
+    _, profit_rates, total_stock_value = compute_holdings(quantities, avg_prices, current_prices)
+
+    response_holdings = [
+        {
             "symbol": holding.symbol,
             "quantity": holding.quantity,
             "avg_price": holding.avg_price,
-            "current_price": current_price,  # 실시간 가격 반영
-            "profit_rate": profit_rate
-        })
+            "current_price": float(current_prices[i]),  # 실시간 가격 반영
+            "profit_rate": float(profit_rates[i]),
+        }
+        for i, holding in enumerate(holdings)
+    ]
 
     return {
         "id": portfolio.id,
@@ -94,6 +100,27 @@ def sell_stock(user_id: int, sell_data: schemas.HoldingSell, db: Session = Depen
     return {"message": result["message"]}
 
 @router.get("/{user_id}/history", response_model=List[schemas.InvestmentRecordResponse])
-def get_portfolio_history(user_id: int, db: Session = Depends(database.get_db)):
+def get_portfolio_history(
+    user_id: int,
+    model_type: Optional[str] = Query(None, description="모델/전략으로 필터 (예: manual_trade)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="최신순 최대 개수"),
+):
     """사용자의 투자(매매) 내역 조회"""
-    return crud.get_investment_history(db, user_id)
\ No newline at end of file
+
+    # DB 커서에서 읽는 대로 JSON 배열을 조각내서 전송 (전체 리스트를 만들지 않음)
+    # 응답이 끝날 때까지 세션이 필요하므로 get_db 대신 제너레이터 안에서 세션을 연다
+    def stream():
+        with database.session_scope() as db:
+            yield b"["
+            first = True
+            for batch in crud.iter_investment_history(db, user_id, model_type=model_type, limit=limit):
+                for row in batch:
+                    # 스키마(InvestmentRecordResponse)와 같이 shares는 정수로 내보냄
+                    if row["shares"] is not None:
+                        row["shares"] = int(row["shares"])
+                chunk = b",".join(orjson.dumps(row) for row in batch)
+                yield chunk if first else b"," + chunk
+                first = False
+            yield b"]"
+
+    return StreamingResponse(stream(), media_type="application/json")
\ No newline at end of file
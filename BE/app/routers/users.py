@@ -16,15 +16,15 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(database.get_db)
 
 @router.post("/login")
 def login(user_data: schemas.UserCreate, db: Session = Depends(database.get_db)):
-    # 1. 이메일로 유저 찾기
-    user = crud.get_user_by_email(db, email=user_data.email)
+    # 1. 이메일로 유저 찾기 (최근 로그인한 유저는 캐시에서)
+    credentials = crud.get_login_credentials(db, email=user_data.email)
     
     # 2. 유저가 없거나 비밀번호가 틀리면 에러
-    if not user or user.hashed_password != user_data.password:
+    if not credentials or credentials[1] != user_data.password:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     
     # 3. 맞으면 user_id 리턴
-    return {"user_id": user.id, "email": user.email}
+    return {"user_id": credentials[0], "email": user_data.email}
 
 @router.get("/me")
 def read_users_me(user_id: int, db: Session = Depends(database.get_db)):
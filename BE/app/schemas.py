@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from datetime import datetime
 class UserBase(BaseModel):
@@ -17,8 +17,7 @@ class User(UserBase):
     onboarding_completed: bool = False  # 온보딩 완료 여부
     created_at: datetime | None = None  # 가입 시각
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 # 주식 추가 요청
 class HoldingCreate(BaseModel):
     symbol: str
@@ -40,8 +39,7 @@ class HoldingResponse(BaseModel):
     current_price: float = 0.0 # 현재가
     profit_rate: float = 0.0   # 수익률 (%)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # 포트폴리오 전체 응답
 class PortfolioResponse(BaseModel):
@@ -52,8 +50,7 @@ class PortfolioResponse(BaseModel):
     total_asset: float     # 총 자산 (예수금 + 주식 평가액)
     holdings: List[HoldingResponse] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # 매도 요청용 스키마
 class HoldingSell(BaseModel):
@@ -82,8 +79,7 @@ class StockPrice(StockPriceBase):
     id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 class InvestmentRecordResponse(BaseModel):
     id: int
     timestamp: datetime
@@ -96,5 +92,4 @@ class InvestmentRecordResponse(BaseModel):
     pnl: float | None = None
     gpt_explanation: str | None = None
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+과거 시그널(/ai/history) 결과 디스크 캐시.
+
+히스토리 계산은 데이터 다운로드 + 전체 기간 추론이라 수 초가 걸리지만, 같은 날 같은 시작일로 다시
+계산하면 결과가 같으므로 .cache/signals/{wrapper}/{start_date}.json 에 {ts, end, payload}로 저장해 둠.
+- end(계산한 날짜)가 오늘이 아니면 새 거래일 데이터가 붙었으므로 무효
+- 오늘 데이터까지 포함하는 모델(MARL)은 장중 값이 바뀔 수 있어 짧은 TTL을 추가로 적용
+서버 재시작/워커 프로세스 간에도 공유됨.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+import orjson
+
+CACHE_DIR = os.getenv(
+    "SIGNAL_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "signals"),
+)
+# 오늘 데이터를 포함하는 결과의 유효 시간 (초)
+TODAY_TTL = float(os.getenv("SIGNAL_CACHE_TODAY_TTL", "300"))
+
+
+class FileCache:
+    def __init__(self, root: str = CACHE_DIR):
+        self.root = root
+
+    def _path(self, wrapper: str, start_date: str) -> Optional[str]:
+        # start_date는 쿼리 파라미터 그대로 들어오므로 날짜 형식만 파일 이름으로 허용
+        try:
+            key = datetime.strptime(start_date, "%Y-%m-%d").strftime("%Y-%m-%d")
+        except (TypeError, ValueError):
+            return None
+        return os.path.join(self.root, wrapper, f"{key}.json")
+
+    def get(self, wrapper: str, start_date: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """캐시된 payload 반환. 없거나 만료되면 None (ttl=None이면 같은 날 동안 유효)"""
+        path = self._path(wrapper, start_date)
+        if path is None:
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                entry = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+        if entry.get("end") != datetime.now().strftime("%Y-%m-%d"):
+            return None
+        if ttl is not None and time.time() - entry.get("ts", 0) > ttl:
+            return None
+        return entry.get("payload")
+
+    def set(self, wrapper: str, start_date: str, payload: Any):
+        path = self._path(wrapper, start_date)
+        if path is None:
+            return
+
+        entry = {
+            "ts": time.time(),
+            "end": datetime.now().strftime("%Y-%m-%d"),
+            "payload": payload,
+        }
+        # 임시 파일에 쓰고 os.replace로 교체 → 동시에 읽는 요청이 반쯤 쓰인 파일을 보지 않음
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(entry))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[SignalCache] Write failed for {path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+signal_cache = FileCache()
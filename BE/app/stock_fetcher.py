@@ -1,17 +1,81 @@
-import yfinance as yf
-import pandas as pd
-from typing import Dict, Any, Optional
+import os
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 
-def fetch_current_price(symbol: str) -> Optional[float]:
+# yfinance/pandas는 import 비용이 커서 실제로 시세를 조회하는 함수 안에서 import
+# (한 번 import되면 sys.modules에 캐시되므로 이후 호출은 비용 없음)
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Yahoo Finance 시세 API (yfinance Ticker 객체 없이 JSON 한 번으로 현재가 조회)
+_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+# 포트폴리오 API(동기 라우트)는 스레드 풀에서 동시에 실행되므로, 기본 풀 크기(10)를 넘는 동시 조회에서
+# 연결을 버리고 매번 TLS 핸드셰이크를 다시 하지 않도록 keep-alive 커넥션 수를 늘려 둠
+_POOL_SIZE = int(os.getenv("QUOTE_POOL_SIZE", "32"))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=_POOL_SIZE))
+
+# 인증(401/403) 등으로 시세 API를 쓸 수 없으면 이후에는 바로 yfinance로 조회
+_quote_api_available = True
+
+# 거래소 접미사 없이 들어온 한국 종목코드 (6자리 숫자)
+_KRX_CODE = re.compile(r"\d{6}")
+
+
+def close_session():
+    """서버 종료 시 keep-alive 커넥션 정리"""
+    _SESSION.close()
+
+
+@lru_cache(maxsize=4096)
+def normalize_symbol(symbol: str) -> str:
+    """한국 주식 심볼 보정 (6자리 종목코드면 .KS 붙임, 예: 005930 -> 005930.KS)"""
+    return f"{symbol}.KS" if _KRX_CODE.fullmatch(symbol) else symbol
+
+
+def _fetch_quotes(symbols: List[str]) -> Dict[str, float]:
     """
-    Fetches the current price of a stock.
-    portfolio.py에서 이 함수를 직접 import해서 사용합니다.
+    시세 API로 여러 종목의 현재가를 한 번의 요청으로 조회.
+    실패하거나 가격이 없는 종목은 결과에서 빠짐 (호출 측에서 yfinance로 대체).
     """
+    global _quote_api_available
+    if not _quote_api_available or not symbols:
+        return {}
+
+    try:
+        response = _SESSION.get(
+            _QUOTE_URL,
+            params={"symbols": ",".join(symbols), "fields": "regularMarketPrice"},
+            timeout=3,
+        )
+        if response.status_code in (401, 403):
+            print(f"Quote API unavailable (HTTP {response.status_code}), falling back to yfinance")
+            _quote_api_available = False
+            return {}
+        response.raise_for_status()
+        results = orjson.loads(response.content)["quoteResponse"]["result"]
+    except Exception as e:
+        print(f"Error fetching quotes for {symbols}: {e}")
+        return {}
+
+    return {
+        quote["symbol"]: float(quote["regularMarketPrice"])
+        for quote in results
+        if quote.get("regularMarketPrice") is not None
+    }
+
+
+def _fetch_price_yfinance(symbol: str) -> Optional[float]:
+    """yfinance Ticker로 현재가 조회 (시세 API 실패 시 대체 경로)"""
+    import pandas as pd
+    import yfinance as yf
+
     try:
-        # 한국 주식 심볼 보정 (숫자만 있으면 .KS 붙임)
-        if symbol.isdigit():
-            symbol = f"{symbol}.KS"
-            
         ticker = yf.Ticker(symbol)
         
         # 1. Try fast_info first for real-time data
@@ -29,14 +93,43 @@ def fetch_current_price(symbol: str) -> Optional[float]:
         print(f"Error fetching current price for {symbol}: {e}")
         return None
 
-def fetch_historical_data(symbol: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+
+def fetch_current_price(symbol: str) -> Optional[float]:
+    """
+    Fetches the current price of a stock.
+    portfolio.py에서 이 함수를 직접 import해서 사용합니다.
+    """
+    symbol = normalize_symbol(symbol)
+    price = _fetch_quotes([symbol]).get(symbol)
+    if price is not None:
+        return price
+    return _fetch_price_yfinance(symbol)
+
+
+def fetch_current_prices(symbols: List[str]) -> Dict[str, Optional[float]]:
+    """
+    여러 종목의 현재가를 한 번에 조회 (포트폴리오 조회용).
+    반환: {입력 심볼: 현재가 또는 None}
+    """
+    normalized = {symbol: normalize_symbol(symbol) for symbol in symbols}
+    quotes = _fetch_quotes(list(dict.fromkeys(normalized.values())))
+
+    prices = {}
+    for symbol, yf_symbol in normalized.items():
+        price = quotes.get(yf_symbol)
+        prices[symbol] = price if price is not None else _fetch_price_yfinance(yf_symbol)
+    return prices
+
+def fetch_historical_data(symbol: str, period: str = "1mo", interval: str = "1d") -> "pd.DataFrame":
     """
     Fetches historical stock data.
     """
+    import pandas as pd
+    import yfinance as yf
+
+    symbol = normalize_symbol(symbol)
+
     try:
-        if symbol.isdigit():
-            symbol = f"{symbol}.KS"
-            
         ticker = yf.Ticker(symbol)
         history = ticker.history(period=period, interval=interval)
         return history
@@ -48,10 +141,11 @@ def get_stock_info(symbol: str) -> Dict[str, Any]:
     """
     Fetches basic information about a stock.
     """
+    import yfinance as yf
+
+    symbol = normalize_symbol(symbol)
+
     try:
-        if symbol.isdigit():
-            symbol = f"{symbol}.KS"
-            
         ticker = yf.Ticker(symbol)
         return ticker.info
     except Exception as e:
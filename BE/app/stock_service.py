@@ -1,56 +1,42 @@
 from sqlalchemy.orm import Session
-from . import crud, schemas, stock_fetcher
-import pandas as pd
+from . import crud, stock_fetcher
 from datetime import datetime
 
 def fetch_and_save_historical_data(db: Session, symbol: str, period: str = "1mo", interval: str = "1d"):
     """
     Fetches historical data for a symbol and saves it to the database.
     """
+    import pandas as pd
+
     # 1. Fetch data
     df = stock_fetcher.fetch_historical_data(symbol, period=period, interval=interval)
-    
-    # Check latest date in DB
-    latest_date = crud.get_latest_stock_date(db, symbol)
-    
+
     if df.empty:
         print(f"No data found for {symbol}")
         return 0
 
-    # 2. Convert to list of schemas.StockPriceCreate
-    stock_prices = []
-    for index, row in df.iterrows():
-        # yfinance returns index as Timestamp
-        date_val = index.to_pydatetime() if isinstance(index, pd.Timestamp) else index
-        # Normalize to naive datetime (remove timezone) to match DB
-        if date_val.tzinfo is not None:
-            date_val = date_val.replace(tzinfo=None)
+    # 2. Convert to list of row dicts (column-wise, no iterrows / per-row schema objects)
+    # yfinance returns index as Timestamp; normalize to naive datetime (remove timezone) to match DB
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    dates = index.to_pydatetime()
 
-        # Skip if data is not newer than latest_date
-        if latest_date and date_val <= latest_date:
-            continue
+    def column(name):
+        if name not in df.columns:
+            return [None] * len(df)
+        return df[name].astype(float).tolist()
 
-        
-        # Check if data already exists (optional optimization: check max date in DB first)
-        # For now, we rely on the fact that we are just inserting. 
-        # Ideally, we should handle duplicates.
-        
-        sp = schemas.StockPriceCreate(
-            symbol=symbol,
-            date=date_val,
-            open=row.get("Open"),
-            high=row.get("High"),
-            low=row.get("Low"),
-            close=row.get("Close"),
-            volume=row.get("Volume")
+    stock_prices = [
+        {"symbol": symbol, "date": date_val, "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for date_val, o, h, l, c, v in zip(
+            dates, column("Open"), column("High"), column("Low"), column("Close"), column("Volume")
         )
-        stock_prices.append(sp)
+    ]
 
     # 3. Save to DB
-    # Note: This might fail if unique constraint (symbol, date) exists and we try to insert duplicates.
-    # We should probably check for existence or use upsert.
-    # For this MVP, let's assume we are fetching new data or handling errors gracefully.
-    
+    # Rows already stored are skipped by the unique (symbol, date) index
+    # (ON CONFLICT DO NOTHING), so no latest-date pre-check is needed.
     try:
         count = crud.bulk_create_stock_prices(db, stock_prices)
         print(f"Saved {count} records for {symbol}")
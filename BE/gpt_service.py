@@ -1,6 +1,37 @@
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 import os
 
+
+@lru_cache(maxsize=256)
+def _indicators_text_for(items: Tuple[Tuple[str, float], ...]) -> str:
+    """정렬된 (지표명, 값) 튜플 → 프롬프트용 지표 텍스트 (같은 지표 조합이면 캐시 재사용)"""
+    return "\n".join([f"- {k}: {v:.2f}" for k, v in items])
+
+
+@lru_cache(maxsize=8)
+def _rule_explanation(signal_upper: str) -> str:
+    """신호별 규칙 기반 설명 (GPT 없을 때 사용, 신호당 한 번만 생성)"""
+    if signal_upper == "BUY":
+        return (
+            "AI 모델이 현재 시장 상황을 분석한 결과, 매수 시점으로 판단했습니다. "
+            "기술적 지표들이 상승 추세를 나타내고 있으며, 단기적으로 긍정적인 수익을 기대할 수 있습니다. "
+            "다만 시장 변동성을 고려하여 신중한 접근이 필요합니다."
+        )
+    elif signal_upper == "SELL":
+        return (
+            "AI 모델이 현재 시장 상황을 분석한 결과, 매도 시점으로 판단했습니다. "
+            "기술적 지표들이 하락 추세를 나타내고 있으며, 리스크 관리 차원에서 포지션 정리를 권장합니다. "
+            "시장 상황에 대한 신중한 접근과 경계를 유지하여 변동성에 대비하는 것이 중요합니다."
+        )
+    else:  # HOLD
+        return (
+            "AI 모델이 현재 시장 상황을 분석한 결과, 관망 전략이 적절하다고 판단했습니다. "
+            "현재 기술적 지표들이 명확한 방향성을 보이지 않고 있어, "
+            "추가적인 시장 신호를 기다리는 것이 안전한 선택입니다."
+        )
+
+
 def interpret_model_output(
     signal: str,
     technical_indicators: Dict[str, float],
@@ -21,7 +52,7 @@ def interpret_model_output(
             import openai
             openai.api_key = openai_key
             
-            indicators_text = "\n".join([f"- {k}: {v:.2f}" for k, v in technical_indicators.items()])
+            indicators_text = _indicators_text_for(tuple(sorted(technical_indicators.items())))
             
             importance_text = ""
             if feature_importance:
@@ -54,23 +85,4 @@ AI 예측 신호: {signal}
             print(f"GPT API 호출 실패, 규칙 기반 설명 사용: {str(e)}")
     
     # 규칙 기반 설명 (GPT 없을 때)
-    signal_upper = signal.upper()
-    
-    if signal_upper == "BUY":
-        return (
-            "AI 모델이 현재 시장 상황을 분석한 결과, 매수 시점으로 판단했습니다. "
-            "기술적 지표들이 상승 추세를 나타내고 있으며, 단기적으로 긍정적인 수익을 기대할 수 있습니다. "
-            "다만 시장 변동성을 고려하여 신중한 접근이 필요합니다."
-        )
-    elif signal_upper == "SELL":
-        return (
-            "AI 모델이 현재 시장 상황을 분석한 결과, 매도 시점으로 판단했습니다. "
-            "기술적 지표들이 하락 추세를 나타내고 있으며, 리스크 관리 차원에서 포지션 정리를 권장합니다. "
-            "시장 상황에 대한 신중한 접근과 경계를 유지하여 변동성에 대비하는 것이 중요합니다."
-        )
-    else:  # HOLD
-        return (
-            "AI 모델이 현재 시장 상황을 분석한 결과, 관망 전략이 적절하다고 판단했습니다. "
-            "현재 기술적 지표들이 명확한 방향성을 보이지 않고 있어, "
-            "추가적인 시장 신호를 기다리는 것이 안전한 선택입니다."
-        )
+    return _rule_explanation(signal.upper())